@@ -0,0 +1,109 @@
+import json
+import time
+
+from datetime import datetime, timezone
+
+from homework_diff import homework_key
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+loads = orjson.loads if orjson is not None else json.loads
+
+RESPONSE_NOT_DICT = (
+    'check_response. Response не является словарем. Получен тип {}'
+)
+HOMEWORKS_NOT_LIST = (
+    'check_response. homeworks не является списком. Получен тип {}'
+)
+MISSING_KEY = 'Отсутствует ключ "{}" в ответе API'
+
+
+class HomeworkRecord:
+    """Проверенная запись о домашней работе из ответа API."""
+
+    __slots__ = (
+        'key', 'name', 'status', 'lesson_name', 'reviewer_comment',
+        'date_updated',
+    )
+
+    def __init__(self, key, name, status, lesson_name=None,
+                 reviewer_comment=None, date_updated=None):
+        """Запись о работе из ответа API."""
+        self.key = key
+        self.name = name
+        self.status = status
+        self.lesson_name = lesson_name
+        self.reviewer_comment = reviewer_comment
+        self.date_updated = date_updated
+
+    def __repr__(self):
+        """Краткое представление для логов и тестов."""
+        return f'HomeworkRecord({self.key!r}, {self.name!r}, {self.status!r})'
+
+    @classmethod
+    def from_dict(cls, homework):
+        """Запись из словаря API, KeyError при отсутствии ключей."""
+        get = homework.get
+        name = get('homework_name')
+        if name is None:
+            raise KeyError(MISSING_KEY.format('homework_name'))
+        status = get('status')
+        if status is None:
+            raise KeyError(MISSING_KEY.format('status'))
+        return cls(
+            homework_key(homework), name, status, get('lesson_name'),
+            get('reviewer_comment'), get('date_updated'),
+        )
+
+
+class ApiAnswer:
+    """Разобранный ответ API: записи работ, курсор и число отброшенных."""
+
+    __slots__ = ('homeworks', 'current_date', 'skipped')
+
+    def __init__(self, homeworks, current_date, skipped=0):
+        """Разобранный ответ: работы, курсор и число пропущенных."""
+        self.homeworks = homeworks
+        self.current_date = current_date
+        self.skipped = skipped
+
+
+def status_changed_at(record):
+    """Время изменения статуса из date_updated или текущее."""
+    try:
+        changed_at = datetime.strptime(
+            record.date_updated, '%Y-%m-%dT%H:%M:%SZ'
+        )
+    except (TypeError, ValueError):
+        return time.time()
+    return changed_at.replace(tzinfo=timezone.utc).timestamp()
+
+
+def validate_response(response):
+    """Список работ из ответа API, TypeError при неверной структуре."""
+    if not isinstance(response, dict):
+        raise TypeError(RESPONSE_NOT_DICT.format(type(response)))
+    homeworks = response.get('homeworks')
+    if not isinstance(homeworks, list):
+        raise TypeError(HOMEWORKS_NOT_LIST.format(type(homeworks)))
+    return homeworks
+
+
+def decode_answer(content):
+    """Разбор и проверка тела ответа за один проход."""
+    response = loads(content)
+    homeworks = validate_response(response)
+    records, skipped = [], 0
+    from_dict = HomeworkRecord.from_dict
+    for homework in homeworks:
+        try:
+            records.append(from_dict(homework))
+        except (AttributeError, KeyError):
+            skipped += 1
+    current_date = response.get('current_date')
+    if records and current_date is None:
+        raise KeyError(MISSING_KEY.format('current_date'))
+    return ApiAnswer(records, current_date, skipped)
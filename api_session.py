@@ -0,0 +1,60 @@
+import requests
+
+from requests.adapters import HTTPAdapter
+from settings import (API_CONNECT_TIMEOUT, API_POOL_CONNECTIONS,
+                      API_POOL_MAXSIZE, API_READ_TIMEOUT)
+
+_session = None
+
+
+class PooledSession(requests.Session):
+    """Сессия с пулом keep-alive соединений и таймаутами по умолчанию."""
+
+    def __init__(self, pool_connections=API_POOL_CONNECTIONS,
+                 pool_maxsize=API_POOL_MAXSIZE,
+                 timeout=(API_CONNECT_TIMEOUT, API_READ_TIMEOUT)):
+        """Пул до `pool_maxsize` соединений, `timeout` — для всех запросов."""
+        super().__init__()
+        self.timeout = timeout
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+        )
+        self.mount('https://', self.adapter)
+        self.mount('http://', self.adapter)
+
+    def request(self, method, url, **kwargs):
+        """Запрос с таймаутом (connect, read), если он не задан явно."""
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+    def stats(self):
+        """Счётчики запросов, новых и переиспользованных соединений."""
+        pools = self.adapter.poolmanager.pools
+        connections = requests_count = 0
+        for key in pools.keys():
+            pool = pools[key]
+            connections += pool.num_connections
+            requests_count += pool.num_requests
+        return {
+            'requests': requests_count,
+            'connections': connections,
+            'reused': max(requests_count - connections, 0),
+        }
+
+
+def get_session():
+    """Общая для процесса сессия к API Практикума."""
+    global _session
+    if _session is None:
+        _session = PooledSession()
+    return _session
+
+
+def close_session():
+    """Закрывает общую сессию и её пул соединений."""
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
@@ -0,0 +1,107 @@
+import logging
+import threading
+import time
+
+from api_schema import status_changed_at
+from concurrent.futures import ThreadPoolExecutor
+from credentials import InvalidTokenError
+from metrics import BACKFILLS, ERRORS
+from settings import BACKFILL_FROM_DATE, BACKFILL_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+class Backfill:
+    """Загрузка истории статусов новых подписок без уведомлений.
+
+    История грузится в собственном ограниченном пуле потоков, а не в
+    цикле опроса: пока подписка не загружена, движок её пропускает.
+    `fetch(subscription, from_date)` возвращает ApiAnswer или None, если
+    загрузку нужно повторить позже (например, после обновления токена).
+    """
+
+    def __init__(self, fetch, store, events=None, workers=BACKFILL_WORKERS,
+                 from_date=BACKFILL_FROM_DATE):
+        """Пул из `workers` потоков, история с `from_date`."""
+        self.fetch = fetch
+        self.store = store
+        self.events = events
+        self.from_date = from_date
+        self._executor = ThreadPoolExecutor(
+            workers, thread_name_prefix='backfill'
+        )
+        self._active = set()
+        self._lock = threading.Lock()
+        self._stopped = False
+
+    def __len__(self):
+        """Число загрузок в работе."""
+        return len(self._active)
+
+    def admits(self, subscription):
+        """Можно ли опрашивать подписку; новую ставит на загрузку."""
+        if subscription.current_date:
+            return True
+        self.submit(subscription)
+        return False
+
+    def submit(self, subscription):
+        """Ставит загрузку истории подписки в пул, если её там нет."""
+        with self._lock:
+            if self._stopped or subscription.key in self._active:
+                return None
+            self._active.add(subscription.key)
+        return self._executor.submit(self._backfill, subscription)
+
+    def run(self, subscriptions):
+        """Загружает историю пачки подписок и ждёт завершения."""
+        futures = [
+            future for future in map(self.submit, subscriptions)
+            if future is not None
+        ]
+        return sum(future.result() for future in futures)
+
+    def stop(self):
+        """Отменяет ещё не начатые загрузки и ждёт текущие."""
+        with self._lock:
+            self._stopped = True
+        self._executor.shutdown(wait=True)
+
+    def _backfill(self, subscription):
+        try:
+            if self._stopped:
+                return 0
+            answer = self.fetch(subscription, self.from_date)
+            if answer is None:
+                return 0
+            self.apply(subscription, answer)
+        except InvalidTokenError as error:
+            BACKFILLS.labels('rejected').inc()
+            logger.warning('История подписки %s не загружена: %s',
+                           subscription.key, error)
+            return 0
+        except Exception as error:
+            BACKFILLS.labels('failed').inc()
+            ERRORS.labels('backfill', type(error).__name__).inc()
+            logger.error(
+                'Не удалось загрузить историю подписки %s: %s',
+                subscription.key, error,
+            )
+            return 0
+        finally:
+            with self._lock:
+                self._active.discard(subscription.key)
+        BACKFILLS.labels('done').inc()
+        return len(answer.homeworks)
+
+    def apply(self, subscription, answer):
+        """Записывает последние статусы и курсор без рассылки."""
+        for record in subscription.statuses.diff(answer.homeworks):
+            subscription.statuses[record.key] = record.status
+            self.store.set_status(subscription.key, record.key, record.status)
+            if self.events is not None:
+                self.events.append(
+                    status_changed_at(record), subscription.key, record
+                )
+        subscription.current_date = answer.current_date or int(time.time())
+        self.store.set_cursor(subscription.key, subscription.current_date)
@@ -0,0 +1 @@
+"""Нагрузочные сценарии бота на локальных фейках API."""
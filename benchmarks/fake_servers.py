@@ -0,0 +1,159 @@
+import json
+import random
+import threading
+import time
+
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STATUSES = ('reviewing', 'approved', 'rejected')
+
+
+class FakeServer:
+    """Локальный HTTP-сервер в фоновом потоке."""
+
+    handler = None
+
+    def __init__(self, host='127.0.0.1', port=0):
+        """HTTP-сервер на свободном порту."""
+        self.server = ThreadingHTTPServer((host, port), self.handler)
+        self.server.daemon_threads = True
+        self.server.request_queue_size = 1024
+        self.server.fake = self
+
+    @property
+    def url(self):
+        """Базовый адрес сервера."""
+        host, port = self.server.server_address
+        return f'http://{host}:{port}'
+
+    def start(self):
+        """Запускает сервер."""
+        threading.Thread(
+            target=self.server.serve_forever, daemon=True
+        ).start()
+        return self
+
+    def stop(self):
+        """Останавливает сервер."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    """Обработчик без журнала запросов в stderr."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        """Журнал запросов отключён."""
+
+    def send_json(self, status, data):
+        """Отправляет JSON-ответ."""
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class PracticumHandler(QuietHandler):
+    """Ответы эндпоинта homework_statuses."""
+
+    def do_GET(self):
+        """Список работ токена из заголовка Authorization."""
+        fake = self.server.fake
+        if fake.latency:
+            time.sleep(fake.latency)
+        if random.random() < fake.error_rate:
+            self.send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {})
+            return
+        token = self.headers.get('Authorization', '')
+        fake.requests += 1
+        self.send_json(HTTPStatus.OK, {
+            'homeworks': fake.homeworks(token),
+            'current_date': int(time.time()),
+        })
+
+
+class FakePracticum(FakeServer):
+    """API Практикума с задержкой, ошибками и сменой статусов."""
+
+    handler = PracticumHandler
+
+    def __init__(self, payload_size=3, change_rate=0.1, latency=0.0,
+                 error_rate=0.0, **kwargs):
+        """API с заданными размером ответа, частотой изменений и ошибок."""
+        super().__init__(**kwargs)
+        self.payload_size = payload_size
+        self.change_rate = change_rate
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = 0
+        self.changes = {}
+        self._homeworks = {}
+        self._lock = threading.Lock()
+
+    def homeworks(self, token):
+        """Работы токена; иногда у одной из них меняется статус."""
+        with self._lock:
+            homeworks = self._homeworks.get(token)
+            if homeworks is None:
+                homeworks = self._homeworks[token] = [
+                    {
+                        'id': index,
+                        'homework_name': f'{token.split()[-1]}-{index}',
+                        'lesson_name': 'Итоговый проект',
+                        'reviewer_comment': '',
+                        'status': 'reviewing',
+                        'date_updated': '2022-01-01T00:00:00Z',
+                    }
+                    for index in range(self.payload_size)
+                ]
+            if homeworks and random.random() < self.change_rate:
+                homework = random.choice(homeworks)
+                homework['status'] = random.choice(
+                    [s for s in STATUSES if s != homework['status']]
+                )
+                self.changes[homework['homework_name']] = time.monotonic()
+            return [dict(homework) for homework in homeworks]
+
+
+class TelegramHandler(QuietHandler):
+    """Метод sendMessage Bot API."""
+
+    def do_POST(self):
+        """Принимает сообщение и отвечает объектом Message."""
+        fake = self.server.fake
+        length = int(self.headers.get('Content-Length', 0))
+        data = json.loads(self.rfile.read(length) or b'{}')
+        fake.received(data.get('chat_id'), data.get('text', ''))
+        self.send_json(HTTPStatus.OK, {'ok': True, 'result': {
+            'message_id': len(fake.messages),
+            'date': int(time.time()),
+            'chat': {'id': data.get('chat_id'), 'type': 'private'},
+            'text': data.get('text', ''),
+        }})
+
+
+class FakeTelegram(FakeServer):
+    """Bot API Telegram, запоминающий полученные сообщения."""
+
+    handler = TelegramHandler
+
+    def __init__(self, **kwargs):
+        """Сервер, запоминающий отправленные сообщения."""
+        super().__init__(**kwargs)
+        self.messages = []
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        """base_url для telegram.Bot."""
+        return f'{self.url}/bot'
+
+    def received(self, chat_id, text):
+        """Фиксирует время получения сообщения."""
+        with self._lock:
+            self.messages.append((time.monotonic(), chat_id, text))
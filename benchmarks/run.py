@@ -0,0 +1,221 @@
+"""Бенчмарк конвейера homework.py на фейковых API Практикума и Telegram."""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+
+from os.path import abspath, dirname
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+import homework  # noqa: E402
+import telegram  # noqa: E402
+from benchmarks.fake_servers import FakePracticum, FakeTelegram  # noqa: E402
+from credentials import CredentialProvider  # noqa: E402
+from delivery import DeliveryQueue  # noqa: E402
+from engine import PollEngine  # noqa: E402
+from fanout import FanOut  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from state_store import open_state_store  # noqa: E402
+from subscriptions import SubscriptionRegistry  # noqa: E402
+from telegram.utils.request import Request  # noqa: E402
+
+SCENARIOS = {
+    'single': {'subscriptions': 1, 'period': 0.05},
+    'thousand': {'subscriptions': 1_000, 'period': 1},
+    'hundred-thousand': {'subscriptions': 100_000, 'period': 30},
+}
+HIGHER_IS_BETTER = ('polls_per_sec', 'notifications_per_sec')
+LOWER_IS_BETTER = (
+    'bytes_per_subscription', 'latency_p50', 'latency_p99', 'tick_seconds'
+)
+HOMEWORK_NAME = re.compile(r'работы "([^"]+)"')
+
+
+def build_registry(count, statuses=0):
+    """Реестр из `count` подписок с `statuses` известными работами."""
+    registry = SubscriptionRegistry()
+    for index in range(count):
+        subscription = registry.subscribe(f'token-{index}', index)
+        for homework_id in range(statuses):
+            subscription.statuses[str(homework_id)] = 'reviewing'
+    return registry
+
+
+def memory_per_subscription(count, statuses):
+    """Байт памяти на подписку вместе с индексом статусов."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    registry = build_registry(count, statuses)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del registry
+    return size / count
+
+
+def percentile(values, fraction):
+    """Перцентиль по отсортированной выборке."""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def end_to_end_latencies(practicum, telegram_api):
+    """Задержки от смены статуса до получения сообщения в Telegram."""
+    latencies = []
+    for received_at, _, text in telegram_api.messages:
+        for name in HOMEWORK_NAME.findall(text):
+            changed_at = practicum.changes.get(name)
+            if changed_at is not None:
+                latencies.append(received_at - changed_at)
+    return latencies
+
+
+async def drive(engine, duration):
+    """Крутит движок `duration` секунд."""
+    asyncio.get_running_loop().call_later(duration, engine.stop)
+    await engine.run()
+
+
+def run_scenario(subscriptions, period, duration=10, concurrency=100,
+                 payload_size=3, change_rate=0.1, latency=0.0,
+                 error_rate=0.0):
+    """Прогон конвейера homework.py против локальных фейков."""
+    practicum = FakePracticum(
+        payload_size=payload_size, change_rate=change_rate,
+        latency=latency, error_rate=error_rate,
+    ).start()
+    telegram_api = FakeTelegram().start()
+    endpoint = homework.ENDPOINT
+    homework.ENDPOINT = f'{practicum.url}/api/user_api/homework_statuses/'
+    bot = telegram.Bot(
+        '123456:benchmark', base_url=telegram_api.base_url,
+        request=Request(con_pool_size=8),
+    )
+    delivery = DeliveryQueue(bot, global_rate=100_000, chat_rate=1_000)
+    store = open_state_store('sqlite', ':memory:')
+    registry = build_registry(subscriptions)
+    cache = ResponseCache()
+    fanout = FanOut(delivery, homework.TEMPLATES, registry)
+    credentials = CredentialProvider()
+    polls = []
+
+    async def poll(subscription):
+        started = time.monotonic()
+        try:
+            return await homework.poll_subscription(
+                fanout, cache, store, credentials, subscription
+            )
+        finally:
+            polls.append(time.monotonic() - started)
+
+    engine = PollEngine(registry, poll, period, concurrency)
+    ticks = []
+    due = engine.scheduler.pop_due
+
+    def timed_due(now):
+        started = time.perf_counter()
+        try:
+            return due(now)
+        finally:
+            ticks.append(time.perf_counter() - started)
+
+    engine.scheduler.pop_due = timed_due
+    delivery.start()
+    started = time.monotonic()
+    try:
+        asyncio.run(drive(engine, duration))
+        delivery.stop(timeout=5)
+    finally:
+        elapsed = time.monotonic() - started
+        homework.ENDPOINT = endpoint
+        store.close()
+        practicum.stop()
+        telegram_api.stop()
+    latencies = end_to_end_latencies(practicum, telegram_api)
+    return {
+        'subscriptions': subscriptions,
+        'polls_per_sec': len(polls) / elapsed,
+        'notifications_per_sec': len(telegram_api.messages) / elapsed,
+        'bytes_per_subscription': memory_per_subscription(
+            min(subscriptions, 10_000), payload_size
+        ),
+        'latency_p50': percentile(latencies, 0.5),
+        'latency_p99': percentile(latencies, 0.99),
+        'poll_p50': percentile(polls, 0.5),
+        'tick_seconds': statistics.mean(ticks) if ticks else None,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Список регрессий относительно сохранённых результатов."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name, {})
+        for key in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+            current, previous = result.get(key), base.get(key)
+            if not current or not previous:
+                continue
+            change = (current - previous) / previous
+            if key in HIGHER_IS_BETTER:
+                change = -change
+            if change > tolerance:
+                regressions.append(
+                    f'{name}.{key}: {previous:.4g} -> {current:.4g} '
+                    f'({change:+.0%})'
+                )
+    return regressions
+
+
+def parse_args(argv=None):
+    """Аргументы командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--scenario', action='append', choices=sorted(SCENARIOS),
+        help='сценарий; по умолчанию все',
+    )
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--payload-size', type=int, default=3)
+    parser.add_argument('--output', help='куда сохранить результаты JSON')
+    parser.add_argument('--baseline', help='результаты для сравнения')
+    parser.add_argument('--tolerance', type=float, default=0.1)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Прогоняет сценарии и сравнивает с базовой линией."""
+    args = parse_args(argv)
+    logging.disable(logging.CRITICAL)
+    results = {}
+    for name in args.scenario or SCENARIOS:
+        results[name] = run_scenario(
+            duration=args.duration, concurrency=args.concurrency,
+            latency=args.latency, error_rate=args.error_rate,
+            payload_size=args.payload_size, **SCENARIOS[name],
+        )
+        print(name, json.dumps(results[name], indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print('РЕГРЕССИЯ', regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
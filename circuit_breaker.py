@@ -0,0 +1,130 @@
+import logging
+import threading
+import time
+
+import requests
+
+from settings import (API_BULKHEAD_SIZE, API_BULKHEAD_TIMEOUT,
+                      CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_HALF_OPEN_CALLS,
+                      CIRCUIT_RESET_TIMEOUT)
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+HALF_OPEN = 'half_open'
+OPEN = 'open'
+STATES = (CLOSED, HALF_OPEN, OPEN)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Запрос отклонён: предохранитель эндпоинта разомкнут."""
+
+    def __init__(self, name, retry_after):
+        """Ошибка с временем до следующей попытки."""
+        super().__init__(
+            f'Эндпоинт {name} недоступен, повтор через {retry_after:.0f} с'
+        )
+        self.retry_after = retry_after
+
+
+class BulkheadFullError(requests.ConnectionError):
+    """Все слоты эндпоинта заняты дольше допустимого ожидания."""
+
+
+class CircuitBreaker:
+    """Предохранитель эндпоинта, общий для всех подписок процесса."""
+
+    def __init__(self, name, failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout=CIRCUIT_RESET_TIMEOUT,
+                 half_open_calls=CIRCUIT_HALF_OPEN_CALLS,
+                 is_failure=None, on_change=None, clock=time.monotonic):
+        """Размыкатель для эндпоинта `name`."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.is_failure = is_failure
+        self.on_change = on_change
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._lock = threading.Lock()
+
+    def call(self, func, *args, **kwargs):
+        """Вызывает `func` через предохранитель и учитывает исход."""
+        self.before_call()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        if self.is_failure is not None and self.is_failure(result):
+            self.record_failure()
+        else:
+            self.record_success()
+        return result
+
+    def before_call(self):
+        """CircuitOpenError, если запрос сейчас пропускать нельзя."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            remaining = self._opened_at + self.reset_timeout - self.clock()
+            if self.state == OPEN and remaining <= 0:
+                self._set_state(HALF_OPEN)
+            if self.state == HALF_OPEN and self._trials < self.half_open_calls:
+                self._trials += 1
+                return
+            raise CircuitOpenError(self.name, max(remaining, 0))
+
+    def record_success(self):
+        """Успешный запрос замыкает предохранитель."""
+        with self._lock:
+            self.failures = 0
+            if self.state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self):
+        """Неудачный запрос; после порога или пробы — размыкание."""
+        with self._lock:
+            self.failures += 1
+            if (self.state == HALF_OPEN
+                    or self.failures >= self.failure_threshold):
+                self._opened_at = self.clock()
+                if self.state != OPEN:
+                    self._set_state(OPEN)
+
+    def _set_state(self, state):
+        previous, self.state = self.state, state
+        self._trials = 0
+        logger.warning(
+            'Предохранитель %s: %s -> %s', self.name, previous, state
+        )
+        if self.on_change is not None:
+            self.on_change(self, previous, state)
+
+
+class Bulkhead:
+    """Ограничение одновременных запросов к одному эндпоинту."""
+
+    def __init__(self, name, size=API_BULKHEAD_SIZE,
+                 timeout=API_BULKHEAD_TIMEOUT):
+        """Не больше `size` одновременных запросов к `name`."""
+        self.name = name
+        self.size = size
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(size)
+
+    def __enter__(self):
+        """Занимает слот или BulkheadFullError через `timeout`."""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise BulkheadFullError(
+                f'Нет свободных слотов для запросов к {self.name}'
+            )
+        return self
+
+    def __exit__(self, *exc_info):
+        """Освобождает слот."""
+        self._slots.release()
@@ -0,0 +1,62 @@
+import logging
+
+import requests
+
+from settings import TOKEN_DISABLE_INTERVAL
+from subscriptions import auth_headers
+
+logger = logging.getLogger(__name__)
+
+TOKEN_REJECTED = (
+    'Токен Практикума отклонён API, уведомления приостановлены. '
+    'Отправьте новый токен командой /subscribe <токен>.'
+)
+
+
+class InvalidTokenError(requests.ConnectionError):
+    """Токен подписки отклонён API и временно не используется."""
+
+    def __init__(self, key, retry_after):
+        """Ошибка с временем до следующей попытки."""
+        super().__init__(
+            f'Токен подписки {key} отклонён API, '
+            f'следующая попытка через {retry_after:.0f} с'
+        )
+        self.retry_after = retry_after
+
+
+class CredentialProvider:
+    """Заголовки авторизации подписок и отключение отозванных токенов.
+
+    Заголовки и отметка об отключении хранятся в самой подписке, поэтому
+    проверка токена перед опросом стоит O(1) и не держит лишних словарей.
+    """
+
+    def __init__(self, refresh=None, disable_interval=TOKEN_DISABLE_INTERVAL):
+        """Обновление токенов через `refresh` или отключение."""
+        self.refresh = refresh
+        self.disable_interval = disable_interval
+
+    def check(self, subscription, now):
+        """InvalidTokenError, если токен подписки сейчас отключён."""
+        if subscription.disabled_until > now:
+            raise InvalidTokenError(
+                subscription.key, subscription.disabled_until - now
+            )
+
+    def reject(self, subscription, now):
+        """Ответ 401: новый токен из `refresh` или отключение на время.
+
+        Возвращает True, если токен удалось обновить.
+        """
+        token = self.refresh(subscription) if self.refresh else None
+        if token:
+            subscription.headers = auth_headers(token)
+            logger.warning('Токен подписки %s обновлён', subscription.key)
+            return True
+        subscription.disabled_until = now + self.disable_interval
+        logger.error(
+            'Токен подписки %s отклонён API, опросы приостановлены',
+            subscription.key,
+        )
+        return False
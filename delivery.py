@@ -0,0 +1,231 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from concurrent.futures import Future
+from metrics import ERRORS, MESSAGES, TELEGRAM_LATENCY
+from settings import (DELIVERY_BACKOFF, DELIVERY_CHAT_RATE,
+                      DELIVERY_GLOBAL_RATE, DELIVERY_MAX_ATTEMPTS,
+                      DELIVERY_WORKERS, TELEGRAM_MESSAGE_LIMIT)
+from telegram.error import BadRequest, NetworkError, RetryAfter, TelegramError
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Ведро токенов: `rate` событий в секунду, всплеск до `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        """Ведро, полное в начале работы."""
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Забирает токен и возвращает, сколько секунд нужно подождать."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            return max(-self.tokens / self.rate, 0.0)
+
+
+class DeliveryQueue:
+    """Очередь отправки в Telegram с лимитами, повторами и склейкой."""
+
+    def __init__(self, bot, workers=DELIVERY_WORKERS,
+                 global_rate=DELIVERY_GLOBAL_RATE,
+                 chat_rate=DELIVERY_CHAT_RATE,
+                 max_attempts=DELIVERY_MAX_ATTEMPTS,
+                 backoff=DELIVERY_BACKOFF):
+        """Очередь с лимитами Telegram; воркеры — `start`."""
+        self.bot = bot
+        self.workers = workers
+        self.global_bucket = TokenBucket(global_rate)
+        self.chat_interval = 1 / chat_rate
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._pending = {}
+        self._heap = []
+        self._ready_at = {}
+        self._sending = set()
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._threads = []
+        self._running = False
+
+    def __len__(self):
+        """Число сообщений в очереди."""
+        with self._condition:
+            return sum(len(batch) for batch in self._pending.values())
+
+    def start(self):
+        """Запускает рабочие потоки отправки."""
+        self._running = True
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f'delivery-{index}', daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Отправляет накопленное и останавливает рабочие потоки."""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(
+                None if deadline is None
+                else max(deadline - time.monotonic(), 0)
+            )
+        self._threads = []
+
+    def enqueue(self, chat_id, text):
+        """Ставит сообщение в очередь, Future завершится итогом отправки."""
+        return self.enqueue_many([(chat_id, text)])[0]
+
+    def enqueue_many(self, messages):
+        """Ставит пачку (chat_id, text) в очередь под одной блокировкой.
+
+        Повтор текста, уже ждущего отправки в тот же чат, не дублируется:
+        возвращается Future ранее поставленного сообщения.
+        """
+        futures, new_chats = [], 0
+        with self._condition:
+            now = time.monotonic()
+            for chat_id, text in messages:
+                batch = self._pending.get(chat_id)
+                if batch is None:
+                    batch = self._pending[chat_id] = []
+                    # Чат, в который сейчас идёт отправка, вернётся в
+                    # кучу сам после неё.
+                    if chat_id not in self._sending:
+                        ready_at = max(now, self._ready_at.get(chat_id, 0))
+                        heapq.heappush(self._heap, (
+                            ready_at, next(self._sequence), chat_id
+                        ))
+                        new_chats += 1
+                futures.append(self._append(batch, text))
+            if new_chats == 1:
+                self._condition.notify()
+            elif new_chats:
+                self._condition.notify_all()
+        return futures
+
+    @staticmethod
+    def _append(batch, text):
+        for pending_text, future in batch:
+            if pending_text == text:
+                MESSAGES.labels('duplicate').inc()
+                return future
+        future = Future()
+        batch.append((text, future))
+        return future
+
+    def _work(self):
+        while True:
+            with self._condition:
+                chat_id = self._next_chat()
+                if chat_id is None:
+                    return
+                batch = self._pending.pop(chat_id)
+                self._sending.add(chat_id)
+            try:
+                delivered = self._deliver(chat_id, batch)
+            except Exception as error:
+                ERRORS.labels('telegram', type(error).__name__).inc()
+                logger.error('Сбой при отправке сообщения: %s', error)
+                delivered = False
+            finally:
+                self._release(chat_id)
+            MESSAGES.labels('sent' if delivered else 'failed').inc(len(batch))
+            for _, future in batch:
+                future.set_result(delivered)
+
+    def _next_chat(self):
+        while True:
+            if not self._heap:
+                if not self._running:
+                    return None
+                self._condition.wait()
+                continue
+            now = time.monotonic()
+            ready_at, _, chat_id = self._heap[0]
+            if ready_at > now:
+                self._condition.wait(ready_at - now)
+                continue
+            heapq.heappop(self._heap)
+            return chat_id
+
+    def _deliver(self, chat_id, batch):
+        delivered = True
+        for index, text in enumerate(self._merge(batch)):
+            if index:
+                time.sleep(self.chat_interval)
+            delivered = self._send(chat_id, text) and delivered
+        return delivered
+
+    def _release(self, chat_id):
+        # Лимит чата отсчитывается от конца отправки, а не от выдачи.
+        with self._condition:
+            self._sending.discard(chat_id)
+            now = time.monotonic()
+            ready_at = self._ready_at[chat_id] = now + self.chat_interval
+            if chat_id in self._pending:
+                heapq.heappush(
+                    self._heap, (ready_at, next(self._sequence), chat_id)
+                )
+                self._condition.notify()
+            if len(self._ready_at) > len(self._pending) + 1024:
+                self._ready_at = {
+                    chat: ready for chat, ready in self._ready_at.items()
+                    if ready > now
+                }
+
+    @staticmethod
+    def _merge(batch):
+        texts, size = [], 0
+        for text, _ in batch:
+            if texts and size + len(text) + 2 > TELEGRAM_MESSAGE_LIMIT:
+                yield '\n\n'.join(texts)
+                texts, size = [], 0
+            texts.append(text)
+            size += len(text) + 2
+        yield '\n\n'.join(texts)
+
+    def _send(self, chat_id, text):
+        for attempt in range(self.max_attempts):
+            time.sleep(self.global_bucket.reserve())
+            try:
+                with TELEGRAM_LATENCY.time():
+                    self.bot.send_message(chat_id, text)
+                return True
+            except TelegramError as error:
+                ERRORS.labels('telegram', type(error).__name__).inc()
+                delay = self._retry_delay(error, attempt)
+            if delay is None:
+                return False
+            time.sleep(delay)
+        logger.error('Сбой при отправке сообщения: исчерпаны попытки')
+        return False
+
+    def _retry_delay(self, error, attempt):
+        if isinstance(error, RetryAfter):
+            return error.retry_after
+        if isinstance(error, BadRequest):
+            logger.error('Telegram отклонил сообщение: %s', error)
+            return None
+        if isinstance(error, NetworkError):
+            logger.warning('Сетевая ошибка Telegram: %s', error)
+            return self.backoff * 2 ** attempt
+        logger.error('Сбой при отправке сообщения: %s', error)
+        return None
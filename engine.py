@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from intervals import FixedInterval
+from scheduler import PollScheduler
+from metrics import ERRORS, POLLS
+
+logger = logging.getLogger(__name__)
+
+
+class PollEngine:
+    """Асинхронный планировщик опросов с ограничением конкурентности."""
+
+    def __init__(self, registry, poll, period, concurrency, interval=None,
+                 owns=None, on_error=None, scheduler=None):
+        """Движок опроса подписок `registry` функцией `poll`."""
+        self.registry = registry
+        self.poll = poll
+        self.period = period
+        self.concurrency = concurrency
+        self.interval = interval or FixedInterval(period)
+        self.owns = owns
+        self.on_error = on_error
+        self.scheduler = scheduler or PollScheduler()
+        self._dirty = False
+        self._tasks = set()
+        self._in_flight = set()
+        self._running = False
+        self._semaphore = None
+        self._loop = None
+        self._wakeup = None
+
+    async def run(self):
+        """Запускает цикл опроса до вызова `stop()`."""
+        self._loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        self._loop.set_default_executor(executor)
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.registry.spread(self.period, time.time())
+        self.scheduler.sync(self.registry, time.time())
+        self._running = True
+        while self._running:
+            if self._dirty:
+                self._dirty = False
+                self.scheduler.sync(self.registry, time.time())
+            now = time.time()
+            for subscription in self.scheduler.pop_due(now):
+                if self.owns is None or self.owns(subscription):
+                    self._start(subscription)
+                else:
+                    self.scheduler.schedule(
+                        subscription,
+                        max(now, subscription.next_poll) + self.period,
+                    )
+            delay = self.scheduler.next_due(now + self.period) - time.time()
+            await self._sleep(max(delay, 0))
+        if self._tasks:
+            await asyncio.wait(self._tasks)
+
+    def stop(self):
+        """Останавливает планирование новых опросов."""
+        self._running = False
+        self.wake()
+
+    def wake(self):
+        """Будит планировщик, например после добавления подписки."""
+        self._dirty = True
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _sleep(self, delay):
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    def _start(self, subscription):
+        if subscription.token in self._in_flight:
+            logger.warning('Предыдущий опрос подписки ещё не завершён')
+            return
+        self._in_flight.add(subscription.token)
+        task = asyncio.ensure_future(self._guarded(subscription))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _guarded(self, subscription):
+        changed, failure = False, None
+        try:
+            async with self._semaphore:
+                changed = await self.poll(subscription)
+        except Exception as error:
+            failure = error
+            ERRORS.labels('poll', type(error).__name__).inc()
+            logger.error(
+                'Сбой в работе программы: %s', error,
+                extra={'subscription': subscription.key,
+                       'error_type': type(error).__name__},
+            )
+            if self.on_error is not None:
+                self.on_error(subscription, error)
+        finally:
+            self._in_flight.discard(subscription.token)
+        POLLS.labels(
+            'error' if failure else 'changed' if changed else 'idle'
+        ).inc()
+        delay = self.interval.next_delay(subscription, changed, failure)
+        if self.registry.get(subscription.token) is subscription:
+            self.scheduler.schedule(subscription, time.time() + delay)
@@ -0,0 +1,120 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+import traceback
+
+from collections import OrderedDict
+from metrics import ERROR_ALERTS
+from settings import (ERROR_ALERT_CACHE_SIZE, ERROR_ALERT_FLUSH_INTERVAL,
+                      ERROR_ALERT_WINDOW)
+
+logger = logging.getLogger(__name__)
+
+VOLATILE = re.compile(r'0x[0-9a-f]+|[0-9a-f]{8,}|\d+', re.IGNORECASE)
+ALERT = 'Сбой в работе программы: {}'
+SUMMARY = 'Сбой повторился ещё {count} раз за последние {minutes} мин: {text}'
+
+
+def fingerprint(error):
+    """Отпечаток ошибки: тип, место и текст без чисел и идентификаторов."""
+    frames = traceback.extract_tb(error.__traceback__)
+    place = f'{frames[-1].filename}:{frames[-1].name}' if frames else ''
+    message = VOLATILE.sub('#', str(error))[:200]
+    raw = f'{type(error).__name__}|{place}|{message}'
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+class ErrorAlerts:
+    """Уведомления об ошибках без повторов: первое сразу, затем сводка."""
+
+    def __init__(self, send, window=ERROR_ALERT_WINDOW,
+                 max_size=ERROR_ALERT_CACHE_SIZE,
+                 flush_interval=ERROR_ALERT_FLUSH_INTERVAL,
+                 clock=time.time):
+        """Отправка через `send` со сводками раз в `window` секунд."""
+        self.send = send
+        self.window = window
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        """Число запомненных ошибок."""
+        return len(self._seen)
+
+    def report(self, error):
+        """Учитывает ошибку; отправляет её, только если она новая в окне."""
+        key = fingerprint(error)
+        with self._lock:
+            messages = self._expire(self.clock())
+            entry = self._seen.get(key)
+            if entry is None:
+                text = str(error)
+                self._seen[key] = [self.clock(), 0, text]
+                messages.append(ALERT.format(text))
+                if len(self._seen) > self.max_size:
+                    messages.extend(self._summaries([self._pop_oldest()]))
+            else:
+                entry[1] += 1
+                ERROR_ALERTS.labels('suppressed').inc()
+        self._send(messages)
+
+    def flush(self, everything=False):
+        """Отправляет сводки по окнам, которые уже закончились."""
+        with self._lock:
+            messages = self._expire(
+                float('inf') if everything else self.clock()
+            )
+        self._send(messages)
+
+    def start(self):
+        """Фоновая отправка сводок раз в `flush_interval` секунд."""
+        self._thread = threading.Thread(
+            target=self._flusher, name='error-alerts', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Останавливает фоновый поток и отправляет накопленные сводки."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush(everything=True)
+
+    def _flusher(self):
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+    def _expire(self, now):
+        expired = []
+        while self._seen:
+            started = next(iter(self._seen.values()))[0]
+            if started + self.window > now:
+                break
+            expired.append(self._pop_oldest())
+        return self._summaries(expired)
+
+    def _pop_oldest(self):
+        return self._seen.popitem(last=False)[1]
+
+    def _summaries(self, entries):
+        return [
+            SUMMARY.format(
+                count=count, minutes=self.window // 60, text=text
+            )
+            for _, count, text in entries if count
+        ]
+
+    def _send(self, messages):
+        for message in messages:
+            ERROR_ALERTS.labels('sent').inc()
+            try:
+                self.send(message)
+            except Exception as error:
+                logger.error('Не удалось отправить уведомление: %s', error)
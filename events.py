@@ -0,0 +1,221 @@
+"""Журнал переходов статусов работ и запросы к нему."""
+
+import argparse
+import logging
+import sqlite3
+import sys
+import threading
+import time
+
+from datetime import datetime, timezone
+from settings import (EVENTS_BATCH_SIZE, EVENTS_FLUSH_INTERVAL, EVENTS_PATH,
+                      STATE_SYNCHRONOUS)
+from subscriptions import subscription_key
+
+logger = logging.getLogger(__name__)
+FINAL_STATUSES = ('approved', 'rejected')
+REVIEW_TIMES = '''
+    SELECT lesson, COUNT(*), AVG(at - started)
+    FROM (
+        SELECT lesson, status, at,
+               LAG(status) OVER work AS previous,
+               LAG(at) OVER work AS started
+        FROM events INDEXED BY events_status
+        WHERE status IN ('reviewing', 'approved', 'rejected')
+          AND at >= ? AND at < ?
+        WINDOW work AS (PARTITION BY subscriber, homework ORDER BY at)
+    )
+    WHERE previous = 'reviewing' AND status IN ('approved', 'rejected')
+    GROUP BY lesson
+    ORDER BY lesson
+'''
+
+
+class EventLog:
+    """Упорядоченный по времени журнал переходов статусов в SQLite.
+
+    Индексы по подписчику, работе и статусу начинаются с этого поля и
+    продолжаются временем, поэтому выборки за период идут по индексу.
+    """
+
+    def __init__(self, path, synchronous=STATE_SYNCHRONOUS,
+                 batch_size=EVENTS_BATCH_SIZE,
+                 flush_interval=EVENTS_FLUSH_INTERVAL):
+        """Открывает журнал и создаёт таблицу с индексами."""
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(f'PRAGMA synchronous={synchronous}')
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS events ('
+                'at REAL NOT NULL, subscriber TEXT NOT NULL, '
+                'homework TEXT NOT NULL, name TEXT, lesson TEXT, '
+                'status TEXT NOT NULL, previous TEXT)'
+            )
+            for column in ('subscriber', 'homework', 'status'):
+                self.connection.execute(
+                    f'CREATE INDEX IF NOT EXISTS events_{column} '
+                    f'ON events ({column}, at)'
+                )
+            self.connection.execute(
+                'CREATE INDEX IF NOT EXISTS events_at ON events (at)'
+            )
+        self._pending = []
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._full = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def append(self, at, subscriber, record, previous=None):
+        """Добавляет переход статуса записи работы в буфер журнала.
+
+        После `start` буфер пишет фоновый поток, и вызывающий не ждёт
+        блокировки базы, общей для всех воркеров.
+        """
+        with self._lock:
+            self._pending.append((
+                at, subscriber, record.key, record.name, record.lesson_name,
+                record.status, previous,
+            ))
+            elapsed = time.monotonic() - self._flushed_at
+            due = (len(self._pending) >= self.batch_size
+                   or elapsed >= self.flush_interval)
+        if not due:
+            return
+        if self._thread is None:
+            self.flush()
+        else:
+            self._full.set()
+
+    def flush(self):
+        """Записывает буфер одной транзакцией; при ошибке буфер остаётся."""
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                self._flushed_at = time.monotonic()
+            if not pending:
+                return
+            try:
+                with self.connection:
+                    self.connection.executemany(
+                        'INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        pending,
+                    )
+            except sqlite3.Error as error:
+                with self._lock:
+                    self._pending[:0] = pending
+                logger.error('Не удалось записать журнал событий: %s', error)
+
+    def start(self):
+        """Фоновая запись буфера по размеру или раз в `flush_interval`."""
+        self._thread = threading.Thread(
+            target=self._flusher, name='events', daemon=True
+        )
+        self._thread.start()
+
+    def query(self, subscriber=None, homework=None, status=None,
+              since=0, until=float('inf'), limit=1000):
+        """События за период [since, until) по одному из индексов."""
+        conditions, params = ['at >= ?', 'at < ?'], [since, until]
+        for column, value in (('subscriber', subscriber),
+                              ('homework', homework), ('status', status)):
+            if value is not None:
+                conditions.append(f'{column} = ?')
+                params.append(value)
+        params.append(limit)
+        self.flush()
+        with self._write_lock:
+            return self.connection.execute(
+                'SELECT at, subscriber, homework, name, lesson, status, '
+                'previous FROM events WHERE ' + ' AND '.join(conditions)
+                + ' ORDER BY at LIMIT ?',
+                params,
+            ).fetchall()
+
+    def review_times(self, since=0, until=float('inf')):
+        """(урок, число проверок, среднее время ревью в секундах)."""
+        self.flush()
+        with self._write_lock:
+            return self.connection.execute(
+                REVIEW_TIMES, (since, until)
+            ).fetchall()
+
+    def close(self):
+        """Останавливает фоновую запись, пишет буфер и закрывает базу."""
+        self._stopped.set()
+        self._full.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        self.connection.close()
+
+    def _flusher(self):
+        while not self._stopped.is_set():
+            self._full.wait(self.flush_interval)
+            self._full.clear()
+            self.flush()
+
+
+def timestamp(value):
+    """Время из даты ISO 8601 (UTC, если зона не указана)."""
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def isoformat(value):
+    """Дата ISO 8601 в UTC для вывода."""
+    return datetime.fromtimestamp(value, timezone.utc).isoformat(
+        timespec='seconds'
+    )
+
+
+def parse_args(argv=None):
+    """Аргументы командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--db', default=EVENTS_PATH)
+    parser.add_argument('--since', type=timestamp, default=0)
+    parser.add_argument('--until', type=timestamp, default=float('inf'))
+    commands = parser.add_subparsers(dest='command', required=True)
+    history = commands.add_parser('history', help='переходы статусов')
+    history.add_argument('--token', help='токен Практикума подписчика')
+    history.add_argument('--subscriber', help='ключ подписки')
+    history.add_argument('--homework')
+    history.add_argument('--status')
+    history.add_argument('--limit', type=int, default=1000)
+    commands.add_parser('review-time', help='среднее время ревью по урокам')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Выводит историю переходов или среднее время ревью."""
+    args = parse_args(argv)
+    events = EventLog(args.db)
+    try:
+        if args.command == 'review-time':
+            for lesson, count, seconds in events.review_times(
+                args.since, args.until
+            ):
+                print(f'{lesson}\t{count}\t{seconds / 3600:.1f} ч')
+            return 0
+        subscriber = args.subscriber
+        if args.token:
+            subscriber = subscription_key(args.token)
+        for at, _, homework, name, _, status, previous in events.query(
+            subscriber, args.homework, args.status, args.since, args.until,
+            args.limit,
+        ):
+            print(f'{isoformat(at)}\t{name or homework}\t'
+                  f'{previous or "-"} -> {status}')
+        return 0
+    finally:
+        events.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import json
+import logging
+
+from outbox import message_key
+
+logger = logging.getLogger(__name__)
+
+
+class RoutingRules:
+    """Фильтры получателей: какие статусы и уроки слать в чат."""
+
+    def __init__(self, rules=None):
+        """Правила вида {chat_id: {"statuses": [...], "lessons": [...]}}."""
+        self._rules = {}
+        for chat_id, rule in (rules or {}).items():
+            statuses = rule.get('statuses')
+            lessons = rule.get('lessons')
+            self._rules[str(chat_id)] = (
+                frozenset(statuses) if statuses else None,
+                frozenset(lessons) if lessons else None,
+            )
+
+    def __len__(self):
+        """Число чатов с правилами."""
+        return len(self._rules)
+
+    def allows(self, chat_id, record):
+        """Нужно ли отправлять запись в чат; без правила — всегда."""
+        rule = self._rules.get(str(chat_id))
+        if rule is None:
+            return True
+        statuses, lessons = rule
+        return (
+            (statuses is None or record.status in statuses)
+            and (lessons is None or record.lesson_name in lessons)
+        )
+
+    @classmethod
+    def from_file(cls, path):
+        """Правила из JSON вида {"chat_id": {"statuses": [...]}}."""
+        with open(path, encoding='utf-8') as file:
+            return cls(json.load(file))
+
+
+class FanOut:
+    """Рассылка одного обновления работы во все чаты подписки."""
+
+    def __init__(self, delivery, templates, registry, rules=None,
+                 outbox=None):
+        """Рассылка через `delivery` или журнал `outbox`."""
+        self.delivery = delivery
+        self.templates = templates
+        self.registry = registry
+        self.rules = rules or RoutingRules()
+        self.outbox = outbox
+
+    def publish(self, subscription, record):
+        """Future отправок в чаты подписки; текст рендерится раз на язык."""
+        rendered, messages = {}, []
+        for chat_id in subscription.chat_ids:
+            if not self.rules.allows(chat_id, record):
+                continue
+            language = self.registry.language(chat_id)
+            text = rendered.get(language)
+            if text is None:
+                text = rendered[language] = self.templates.render(
+                    record, language
+                )
+            messages.append((chat_id, text))
+        logger.debug(
+            'Обновление работы %s разослано в %s чатов',
+            record.key, len(messages),
+        )
+        if self.outbox is None:
+            return self.delivery.enqueue_many(messages)
+        previous = subscription.statuses.get(record.key)
+        return self.outbox.send(self.delivery, [
+            (message_key(subscription.key, record, chat_id, previous),
+             chat_id, text)
+            for chat_id, text in messages
+        ])
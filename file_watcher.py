@@ -0,0 +1,54 @@
+import logging
+import os
+import threading
+
+from settings import SUBSCRIPTIONS_WATCH_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+class FileWatcher:
+    """Вызывает `on_change`, когда меняется время изменения файла."""
+
+    def __init__(self, path, on_change,
+                 interval=SUBSCRIPTIONS_WATCH_INTERVAL):
+        """Запоминает текущее время изменения файла."""
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self._mtime = self._stat()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """Сверяет время изменения файла; возвращает True при изменении."""
+        mtime = self._stat()
+        if mtime is None or mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        logger.info('Файл %s изменился', self.path)
+        self.on_change()
+        return True
+
+    def start(self):
+        """Фоновая проверка раз в `interval` секунд."""
+        self._thread = threading.Thread(
+            target=self._watch, name='file-watcher', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Останавливает фоновую проверку."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _watch(self):
+        while not self._stopped.wait(self.interval):
+            self.check()
+
+    def _stat(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
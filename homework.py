@@ -1,14 +1,43 @@
+import asyncio
+import hashlib
 import logging
 import telegram
 import requests
-import sys
 import os
+import signal
+import socket
 import time
 
+from api_schema import (HomeworkRecord, decode_answer, status_changed_at,
+                        validate_response)
+from api_session import close_session, get_session
+from backfill import Backfill
+from circuit_breaker import (CLOSED, OPEN, STATES, Bulkhead,
+                             CircuitBreaker, CircuitOpenError)
+from credentials import TOKEN_REJECTED, CredentialProvider, InvalidTokenError
+from delivery import DeliveryQueue
 from dotenv import load_dotenv
+from engine import PollEngine
+from events import EventLog
+from error_alerts import ErrorAlerts
+from fanout import FanOut, RoutingRules
+from functools import partial
+from intervals import AdaptiveInterval
 from http import HTTPStatus
 from json import JSONDecodeError
-from settings import HOMEWORK_STATUSES
+from response_cache import ResponseCache
+from log_setup import setup_logging
+from outbox import Outbox
+from metrics import (API_CONNECTIONS, API_LATENCY, CIRCUIT_STATE,
+                     NOTIFICATION_DELAY, PARSE_TIME, QUEUE_DEPTH,
+                     STARTUP_TIME, MetricsServer)
+from settings import (EVENTS_PATH, LOG_FILE, LOG_LEVEL, METRICS_HOST,
+                      METRICS_PORT, OUTBOX_PATH, POLL_CONCURRENCY, SHARD_DB,
+                      SHARD_SUPERVISE_INTERVAL, SHUTDOWN_TIMEOUT,
+                      STATE_BACKEND, STATE_PATH, WEBHOOK_HOST, WEBHOOK_PORT)
+from state_store import open_state_store
+from subscriptions import SubscriptionRegistry, auth_headers
+from templates import MessageTemplates
 
 load_dotenv()
 
@@ -16,116 +45,115 @@ load_dotenv()
 PRACTICUM_TOKEN = os.getenv('PRACTICUM_TOKEN')
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
+ALERT_CHAT_ID = os.getenv('ALERT_CHAT_ID', TELEGRAM_CHAT_ID)
+SUBSCRIPTIONS_FILE = os.getenv('SUBSCRIPTIONS_FILE')
+WEBHOOK_URL = os.getenv('WEBHOOK_URL')
+TEMPLATES_FILE = os.getenv('TEMPLATES_FILE')
+ROUTES_FILE = os.getenv('ROUTES_FILE')
+WEBHOOK_PORT = int(os.getenv('PORT', WEBHOOK_PORT))
+LOG_LEVEL = os.getenv('LOG_LEVEL', LOG_LEVEL)
+METRICS_PORT = int(os.getenv('METRICS_PORT', METRICS_PORT))
+SHARD_WORKERS = int(os.getenv('SHARD_WORKERS', 1))
+SHARDING = SHARD_WORKERS > 1 or 'SHARD_DB' in os.environ
+SHARD_DB = os.getenv('SHARD_DB', SHARD_DB)
+NODE_ID = os.getenv('NODE_ID', socket.gethostname())
 
 RETRY_TIME = 600
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+API_BREAKER = CircuitBreaker(
+    ENDPOINT, is_failure=lambda response: response.status_code >= 500
+)
+API_BULKHEAD = Bulkhead(ENDPOINT)
+TEMPLATES = MessageTemplates()
 
 
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.DEBUG,
-    filename='main.log',
-    filemode='w',
-)
 logger = logging.getLogger(__name__)
-handler = logging.StreamHandler(sys.stdout)
-logger.addHandler(handler)
 
 
 def send_message(bot, message):
     """Отправка сообщений в телегу."""
-    logger.info('Начинаем отправку сообщения')
+    send_chat_message(bot, TELEGRAM_CHAT_ID, message)
+
+
+def send_chat_message(bot, chat_id, message):
+    """Отправка сообщения в конкретный чат, True при успехе."""
     try:
-        bot.send_message(TELEGRAM_CHAT_ID, message)
-        logger.info('Сообщение успешно доставлено')
+        bot.send_message(chat_id, message)
+        logger.debug('Сообщение успешно доставлено')
+        return True
     except Exception:
         message = 'Сбой при отправке сообщения'
         logger.error(message)
+        return False
 
 
 def get_api_answer(current_timestamp):
     """Обращение к API и получение ответа."""
-    logger.info('1')
+    return fetch_api_answer(HEADERS, current_timestamp)
+
+
+def fetch_api_answer(headers, current_timestamp):
+    """Обращение к API с заголовками конкретной подписки."""
+    return decode_api_answer(request_api(headers, current_timestamp))
+
+
+def request_api(headers, current_timestamp):
+    """Запрос к API, возвращает ответ без разбора."""
     timestamp = current_timestamp or int(time.time())
     params = {'from_date': timestamp}
-    logger.info('Обращаемся к API')
+    logger.debug('Обращаемся к API')
     try:
-        homework_statuses = requests.get(
-            ENDPOINT,
-            headers=HEADERS,
-            params=params
-        )
-    except Exception:
-        raise requests.ConnectionError()
+        with API_LATENCY.time():
+            return get_session().get(
+                ENDPOINT,
+                headers=headers,
+                params=params
+            )
+    except Exception as error:
+        raise requests.ConnectionError(error) from error
+
+
+def check_api_status(homework_statuses):
+    """Ошибка соединения, если API ответил не 200."""
     if homework_statuses.status_code != HTTPStatus.OK:
-        raise requests.ConnectionError(homework_statuses.status_code)
+        raise requests.ConnectionError(
+            homework_statuses.status_code, response=homework_statuses
+        )
+
+
+def decode_api_answer(homework_statuses):
+    """Проверка кода ответа API и разбор json."""
+    check_api_status(homework_statuses)
     try:
-        full_json = homework_statuses.json()
-        print(full_json)
-        return full_json
+        return homework_statuses.json()
     except JSONDecodeError:
         logger.error('Сервер вернул невалидный json')
 
 
 def check_response(response):
     """Проверяет ответ от эндпоинта на корректность."""
-    logger.info('2')
-    if not isinstance(response, dict):
-        raise TypeError(f'{sys._getframe().f_code.co_name}. '
-                        f'Response не является словарем. '
-                        f'Получен тип {type(response)}')
-    elif not isinstance(response.get('homeworks'), list):
-        raise TypeError(f'{sys._getframe().f_code.co_name}. '
-                        f'homeworks не является списком. '
-                        f'Полуен тип {type(response)}')
-    else:
-        logger.info('4')
-        homeworks = response.get('homeworks')
-        if homeworks:
-            print('все хорошо')
-        else:
-            print('все плохо')
-        logger.info('3')
-        return homeworks
+    return validate_response(response)
 
 
 def parse_status(homework):
     """Получение статуса конкретной домашней работы."""
-    logger.info('6')
-    if 'homework_name' not in homework:
-        raise KeyError('Отсутствует ключ "homework_name" в ответе API')
-    if 'status' not in homework:
-        raise KeyError('Отсутствует ключ "status" в ответе API')
-    logger.info('9')
-    try:
-        logger.info('10')
-        homework_name = homework.get('homework_name')
-        homework_status = homework.get('status')
-        logger.info('11')
-    except KeyError as error:
-        message = f'Неверное значение ключа {error}'
-        logger.error(message)
-    if homework_status not in HOMEWORK_STATUSES:
-        message = ('Статус работы не распознан')
-        logger.error(message)
-        logger.info('12')
-    verdict = HOMEWORK_STATUSES[homework_status]
-    logger.info('13')
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    return TEMPLATES.render(HomeworkRecord.from_dict(homework), strict=True)
 
 
 def check_tokens():
     """Проверка, что все токены получены."""
-    logger.info('5')
-    if not PRACTICUM_TOKEN:
+    if not TELEGRAM_TOKEN:
         message = ("Отсутствует обязательная переменная окружения: "
-                   "'PRACTICUM_TOKEN'")
+                   "'TELEGRAM_TOKEN'")
         logger.critical(message)
         return False
-    if not TELEGRAM_TOKEN:
+    if SUBSCRIPTIONS_FILE or WEBHOOK_URL:
+        logger.info('Подписки задаются файлом или командами вебхука')
+        return True
+    if not PRACTICUM_TOKEN:
         message = ("Отсутствует обязательная переменная окружения: "
-                   "'TELEGRAM_TOKEN'")
+                   "'PRACTICUM_TOKEN'")
         logger.critical(message)
         return False
     if not TELEGRAM_CHAT_ID:
@@ -139,33 +167,431 @@ def check_tokens():
         return True
 
 
-def main():
-    """Основная логика работы бота."""
+def load_templates():
+    """Шаблоны уведомлений из TEMPLATES_FILE или встроенные."""
+    if not TEMPLATES_FILE:
+        return TEMPLATES
+    templates = MessageTemplates.from_file(TEMPLATES_FILE)
+    logger.info('Загружены шаблоны: %s', ', '.join(templates.languages))
+    return templates
+
+
+def load_routes():
+    """Правила маршрутизации уведомлений из ROUTES_FILE."""
+    if not ROUTES_FILE:
+        return RoutingRules()
+    rules = RoutingRules.from_file(ROUTES_FILE)
+    logger.info('Загружено правил маршрутизации: %s', len(rules))
+    return rules
+
+
+def refresh_token(subscription):
+    """Новый PRACTICUM_TOKEN из .env для подписки из окружения."""
+    if subscription.token != PRACTICUM_TOKEN:
+        return None
+    load_dotenv(override=True)
+    token = os.getenv('PRACTICUM_TOKEN')
+    if not token or auth_headers(token) == subscription.headers:
+        return None
+    return token
+
+
+def load_subscriptions():
+    """Собирает реестр подписок из файла и переменных окружения."""
+    if SUBSCRIPTIONS_FILE and os.path.exists(SUBSCRIPTIONS_FILE):
+        registry = SubscriptionRegistry.from_file(SUBSCRIPTIONS_FILE)
+    else:
+        registry = SubscriptionRegistry()
+    if PRACTICUM_TOKEN and TELEGRAM_CHAT_ID:
+        registry.subscribe(PRACTICUM_TOKEN, TELEGRAM_CHAT_ID)
+    logger.info('Загружено подписок: %s', len(registry))
+    return registry
+
+
+def guarded_request(headers, current_timestamp):
+    """Запрос к API через ограничитель слотов и предохранитель."""
+    with API_BULKHEAD:
+        return API_BREAKER.call(request_api, headers, current_timestamp)
+
+
+async def request_api_async(headers, current_timestamp):
+    """Асинхронный запрос к API без блокировки цикла событий."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, guarded_request, headers, current_timestamp
+    )
+
+
+def fetch_history(fanout, credentials, subscription, from_date):
+    """История статусов для загрузки новой подписки.
+
+    Отозванный токен обрабатывается как при опросе; после обновления
+    токена возвращает None, и загрузка повторяется позже.
+    """
+    credentials.check(subscription, time.time())
+    response = API_BREAKER.call(request_api, subscription.headers, from_date)
+    if response.status_code == HTTPStatus.UNAUTHORIZED:
+        reject_token(fanout, credentials, subscription)
+        return None
+    check_api_status(response)
+    return decode_answer(response.content)
+
+
+def admits(coordinator, backfill, subscription):
+    """Опрашивать ли подписку: шард свой и история уже загружена."""
+    if coordinator is not None and not coordinator.owns(subscription):
+        return False
+    return backfill.admits(subscription)
+
+
+def observe_delivery(changed_at, future):
+    """Учитывает задержку доставки уведомления в метриках."""
+    if future.result():
+        NOTIFICATION_DELAY.observe(max(time.time() - changed_at, 0))
+
+
+def notify_homework(fanout, store, subscription, record, events=None):
+    """Постановка изменившегося статуса работы в очередь отправки."""
+    changed_at = status_changed_at(record)
+    observe = partial(observe_delivery, changed_at)
+    for future in fanout.publish(subscription, record):
+        future.add_done_callback(observe)
+    if events is not None:
+        events.append(
+            changed_at, subscription.key, record,
+            subscription.statuses.get(record.key),
+        )
+    subscription.statuses[record.key] = record.status
+    store.set_status(subscription.key, record.key, record.status)
+
+
+def reject_token(fanout, credentials, subscription):
+    """Обработка 401: обновление токена или отключение с уведомлением."""
+    if credentials.reject(subscription, time.time()):
+        return
+    fanout.delivery.enqueue_many(
+        [(chat_id, TOKEN_REJECTED) for chat_id in subscription.chat_ids]
+    )
+    raise InvalidTokenError(subscription.key, credentials.disable_interval)
+
+
+async def poll_subscription(fanout, cache, store, credentials, subscription,
+                            events=None):
+    """Опрос API по одной подписке и рассылка изменившихся статусов."""
+    token, from_date = subscription.token, subscription.current_date
+    credentials.check(subscription, time.time())
+    headers = subscription.headers
+    conditional = cache.request_headers(token, from_date)
+    if conditional:
+        headers = dict(headers, **conditional)
+    api_response = await request_api_async(headers, from_date)
+    if api_response.status_code == HTTPStatus.UNAUTHORIZED:
+        reject_token(fanout, credentials, subscription)
+        return False
+    fingerprint = cache.fingerprint(api_response)
+    if cache.is_unchanged(token, from_date, fingerprint):
+        logger.debug('Ответ API не изменился')
+        return False
+    check_api_status(api_response)
+    with PARSE_TIME.time():
+        answer = decode_answer(api_response.content)
+    if answer.skipped:
+        logger.error('Пропущено некорректных работ: %s', answer.skipped)
+    changed = subscription.statuses.diff(answer.homeworks)
+    for record in changed:
+        notify_homework(fanout, store, subscription, record, events)
+    # Первый опрос без истории тоже сдвигает курсор, иначе подписка
+    # навсегда останется на `from_date=now`.
+    if answer.current_date and (answer.homeworks or not from_date):
+        subscription.current_date = answer.current_date
+        store.set_cursor(subscription.key, subscription.current_date)
+    cache.remember(token, from_date, fingerprint)
+    return bool(changed)
+
+
+def alert_api_state(delivery, breaker, previous, state):
+    """Одно общее уведомление о деградации и восстановлении API."""
+    if state == OPEN and previous == CLOSED:
+        message = (f'API Практикума недоступно, опросы приостановлены '
+                   f'на {breaker.reset_timeout} с')
+    elif state == CLOSED:
+        message = 'API Практикума снова доступно, опросы возобновлены'
+    else:
+        return
+    logger.error(message)
+    if ALERT_CHAT_ID:
+        delivery.enqueue(ALERT_CHAT_ID, message)
+
+
+def start_alerts(delivery):
+    """Уведомления об ошибках опроса в ALERT_CHAT_ID без повторов."""
+    if not ALERT_CHAT_ID:
+        return None
+    alerts = ErrorAlerts(partial(delivery.enqueue, ALERT_CHAT_ID))
+    alerts.start()
+    return alerts
+
+
+def report_error(alerts, subscription, error):
+    """Передаёт сбой опроса в уведомления, кроме разомкнутой цепи."""
+    if not isinstance(error, CircuitOpenError):
+        alerts.report(error)
+
+
+def start_webhook(bot, registry, engine, templates):
+    """Поднимает вебхук Telegram, если задан WEBHOOK_URL."""
+    if not WEBHOOK_URL:
+        return None
+    from webhook import WebhookServer
+
+    secret = hashlib.sha256(TELEGRAM_TOKEN.encode()).hexdigest()[:32]
+    path = f'/webhook/{secret}'
+    server = WebhookServer(
+        registry, WEBHOOK_HOST, WEBHOOK_PORT, path,
+        subscriptions_file=SUBSCRIPTIONS_FILE, on_change=engine.wake,
+        languages=templates.languages,
+    )
+    server.start()
+    bot.set_webhook(url=WEBHOOK_URL.rstrip('/') + path)
+    return server
+
+
+def start_metrics(delivery, port):
+    """Регистрирует метрики процесса и поднимает /metrics."""
+    QUEUE_DEPTH.set_function(delivery.__len__)
+    CIRCUIT_STATE.set_function(lambda: STATES.index(API_BREAKER.state))
+    for kind in ('requests', 'connections', 'reused'):
+        API_CONNECTIONS.labels(kind).set_function(
+            lambda kind=kind: get_session().stats()[kind]
+        )
+    if not METRICS_PORT:
+        return None
+    server = MetricsServer(METRICS_HOST, port)
+    server.start()
+    return server
+
+
+def start_coordinator(worker_id, registry, store):
+    """Аренда шардов для воркера или None без шардирования."""
+    if worker_id is None:
+        return None
+    from sharding import LeaseCoordinator, shard_of
+
+    def reload_shards(shards):
+        store.flush()
+        store.restore([
+            subscription for subscription in registry
+            if shard_of(subscription.key) in shards
+        ])
+
+    def release_shards(shards):
+        # Новый владелец прочитает состояние после истечения аренды,
+        # к этому времени буфер должен быть уже на диске.
+        store.flush()
+
+    coordinator = LeaseCoordinator(
+        SHARD_DB, worker_id, on_acquire=reload_shards,
+        on_release=release_shards,
+    )
+    coordinator.start()
+    logger.info(
+        'Воркер %s владеет шардами: %s',
+        worker_id, len(coordinator.owned_shards()),
+    )
+    return coordinator
+
+
+def worker_path(path, worker_id, worker_index):
+    """Отдельный файл воркера: main.log -> main.1.log."""
+    if worker_id is None:
+        return path
+    name, extension = os.path.splitext(path)
+    return f'{name}.{worker_index}{extension}'
+
+
+def open_outbox(delivery, path):
+    """Журнал уведомлений с досылкой неотправленного после сбоя."""
+    outbox = Outbox(path)
+    outbox.prune()
+    outbox.redeliver(delivery)
+    outbox.start(delivery)
+    return outbox
+
+
+def reload_config(registry, store, fanout, engine):
+    """Перечитывает подписки, шаблоны, маршруты и уровень логов.
+
+    Подписки из вебхука без SUBSCRIPTIONS_FILE живут только в памяти,
+    поэтому в этом случае реестр не перечитывается.
+    """
+    logger.info('Перечитываем настройки')
+    load_dotenv(override=True)
+    logging.getLogger().setLevel(os.getenv('LOG_LEVEL', LOG_LEVEL))
+    try:
+        fanout.templates = load_templates()
+        fanout.rules = load_routes()
+    except (OSError, ValueError, KeyError) as error:
+        logger.error('Не удалось перечитать настройки: %s', error)
+        return
+    if WEBHOOK_URL and not SUBSCRIPTIONS_FILE:
+        logger.warning('SUBSCRIPTIONS_FILE не задан, подписки '
+                       'из вебхука не перечитываются')
+        return
+    reload_subscriptions(registry, store, engine)
+
+
+def reload_subscriptions(registry, store, engine):
+    """Приводит реестр к SUBSCRIPTIONS_FILE и переменным окружения."""
+    try:
+        added = registry.replace(load_subscriptions())
+    except (OSError, ValueError, KeyError) as error:
+        logger.error('Не удалось перечитать подписки: %s', error)
+        return
+    store.restore(added)
+    engine.wake()
+
+
+def watch_subscriptions(worker_id, registry, store, engine):
+    """Воркеры подхватывают подписки, которые вебхук пишет в файл."""
+    if worker_id is None or not SUBSCRIPTIONS_FILE:
+        return None
+    from file_watcher import FileWatcher
+
+    watcher = FileWatcher(
+        SUBSCRIPTIONS_FILE,
+        partial(reload_subscriptions, registry, store, engine),
+    )
+    watcher.start()
+    return watcher
+
+
+async def serve(engine, reload, started):
+    """Опрос до SIGTERM/SIGINT; SIGHUP перечитывает настройки."""
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, engine.stop)
+        loop.add_signal_handler(signal.SIGINT, engine.stop)
+        loop.add_signal_handler(signal.SIGHUP, reload)
+    except (AttributeError, NotImplementedError):
+        logger.warning('Обработчики сигналов недоступны на этой платформе')
+    startup = time.monotonic() - started
+    STARTUP_TIME.set(startup)
+    logger.info('Запуск до первого опроса: %.3f с', startup)
+    await engine.run()
+    logger.info('Опросы остановлены, досылаем уведомления')
+
+
+def run_bot(worker_id=None, worker_index=0):
+    """Опрос подписок в текущем процессе; с worker_id — только своих."""
+    started = time.monotonic()
+    listener = setup_logging(
+        worker_path(LOG_FILE, worker_id, worker_index), LOG_LEVEL
+    )
     if not check_tokens():
         logger.critical('Отсутствует одна или несколько переменных окружения')
+        listener.stop()
         exit()
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
-    current_timestamp = 0
-    status = ''
-    while True:
-        try:
-            response = get_api_answer(current_timestamp)
-            homeworks = check_response(response)
-            logger.info('7')
-            if homeworks:
-                logger.info('8')
-                new_status = parse_status(homeworks[0])
-                print(new_status)
-                if new_status != status:
-                    logger.info('Старт условия')
-                    send_message(bot, new_status)
-                
-            current_timestamp = response['current_date']
-        except Exception as error:
-            message = f'Сбой в работе программы: {error}'
-            logger.error(message)
-        finally:
-            time.sleep(RETRY_TIME)
+    registry = load_subscriptions()
+    templates = load_templates()
+    store = open_state_store(STATE_BACKEND, STATE_PATH)
+    store.restore(registry)
+    coordinator = start_coordinator(worker_id, registry, store)
+    delivery = DeliveryQueue(bot)
+    delivery.start()
+    API_BREAKER.on_change = partial(alert_api_state, delivery)
+    alerts = start_alerts(delivery)
+    outbox = open_outbox(
+        delivery, worker_path(OUTBOX_PATH, worker_id, worker_index)
+    )
+    fanout = FanOut(delivery, templates, registry, load_routes(), outbox)
+    # Один журнал на все воркеры, чтобы CLI читал один файл. Писатель в
+    # SQLite один, поэтому буфер пишется из фонового потока, а не из цикла.
+    events = EventLog(EVENTS_PATH)
+    events.start()
+    credentials = CredentialProvider(refresh_token)
+    backfill = Backfill(
+        partial(fetch_history, fanout, credentials), store, events
+    )
+    engine = PollEngine(
+        registry, partial(
+            poll_subscription, fanout, ResponseCache(), store, credentials,
+            events=events,
+        ),
+        RETRY_TIME, POLL_CONCURRENCY, AdaptiveInterval(RETRY_TIME),
+        owns=partial(admits, coordinator, backfill),
+        on_error=partial(report_error, alerts) if alerts else None,
+    )
+    webhook = None
+    if not worker_index:
+        webhook = start_webhook(bot, registry, engine, templates)
+    watcher = watch_subscriptions(worker_id, registry, store, engine)
+    metrics = start_metrics(delivery, METRICS_PORT + worker_index)
+    reload = partial(reload_config, registry, store, fanout, engine)
+    try:
+        asyncio.run(serve(engine, reload, started))
+    finally:
+        for server in (webhook, watcher, metrics, alerts, backfill, outbox):
+            if server is not None:
+                server.stop()
+        delivery.stop(SHUTDOWN_TIMEOUT)
+        if len(delivery):
+            logger.error('Не доставлено уведомлений: %s', len(delivery))
+        outbox.close()
+        events.close()
+        store.close()
+        # Шарды отпускаются последними: новый владелец должен прочитать
+        # уже записанное состояние.
+        if coordinator is not None:
+            coordinator.stop()
+        close_session()
+        listener.stop()
+
+
+def supervise_workers(count):
+    """Держит запущенными `count` процессов-воркеров с шардами."""
+    import multiprocessing
+
+    listener = setup_logging(LOG_FILE, LOG_LEVEL)
+    if WEBHOOK_URL and not SUBSCRIPTIONS_FILE:
+        logger.warning('Без SUBSCRIPTIONS_FILE подписки из вебхука '
+                       'видит только воркер 0')
+    context = multiprocessing.get_context('spawn')
+    stopping = multiprocessing.Event()
+    signal.signal(signal.SIGTERM, lambda *args: stopping.set())
+    workers = [None] * count
+    try:
+        while not stopping.is_set():
+            for index, process in enumerate(workers):
+                if process is not None and process.is_alive():
+                    continue
+                if process is not None:
+                    logger.error(
+                        'Воркер %s завершился с кодом %s, перезапускаем',
+                        index, process.exitcode,
+                    )
+                workers[index] = context.Process(
+                    target=run_bot, args=(f'{NODE_ID}-{index}', index),
+                    daemon=True,
+                )
+                workers[index].start()
+            stopping.wait(SHARD_SUPERVISE_INTERVAL)
+    finally:
+        for process in workers:
+            if process is not None and process.is_alive():
+                process.terminate()
+        for process in workers:
+            if process is not None:
+                process.join(SHUTDOWN_TIMEOUT)
+        listener.stop()
+
+
+def main():
+    """Основная логика работы бота."""
+    if SHARD_WORKERS > 1:
+        supervise_workers(SHARD_WORKERS)
+    else:
+        run_bot(NODE_ID if SHARDING else None)
 
 
 if __name__ == '__main__':
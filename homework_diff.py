@@ -0,0 +1,35 @@
+from collections import OrderedDict
+from settings import STATUS_INDEX_SIZE
+
+
+def homework_key(homework):
+    """Ключ работы в индексе: id, а при его отсутствии название."""
+    key = homework.get('id', homework.get('homework_name'))
+    return None if key is None else str(key)
+
+
+class StatusIndex(OrderedDict):
+    """Последние статусы работ подписки с вытеснением самых старых."""
+
+    def __init__(self, *args, max_size=STATUS_INDEX_SIZE, **kwargs):
+        """Индекс не больше `max_size` работ."""
+        self.max_size = max_size
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, key, value):
+        """Обновляет статус и вытесняет самые старые работы."""
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_size:
+            self.popitem(last=False)
+
+    def diff(self, records):
+        """Записи работ, статус которых изменился, за O(n)."""
+        latest = {}
+        for record in records:
+            latest.setdefault(record.key, record)
+        get = self.get
+        return [
+            record for key, record in latest.items()
+            if get(key) != record.status
+        ]
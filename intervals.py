@@ -0,0 +1,73 @@
+import random
+import time
+
+from email.utils import parsedate_to_datetime
+from settings import (POLL_ERROR_INTERVAL, POLL_IDLE_STEP, POLL_JITTER,
+                      POLL_MAX_INTERVAL, POLL_REVIEWING_INTERVAL)
+
+
+def retry_after(error):
+    """Секунды из заголовка Retry-After ответа, вызвавшего ошибку."""
+    delay = getattr(error, 'retry_after', None)
+    if delay is not None:
+        return delay
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+class FixedInterval:
+    """Постоянный интервал между опросами подписки."""
+
+    def __init__(self, period):
+        """Постоянный интервал `period`."""
+        self.period = period
+
+    def next_delay(self, subscription, changed=False, error=None):
+        """Задержка до следующего опроса подписки."""
+        return self.period
+
+
+class AdaptiveInterval:
+    """Интервал опроса: чаще во время ревью, реже для тихих и сбоящих."""
+
+    def __init__(self, period, reviewing=POLL_REVIEWING_INTERVAL,
+                 error=POLL_ERROR_INTERVAL, max_interval=POLL_MAX_INTERVAL,
+                 jitter=POLL_JITTER):
+        """Интервалы по состоянию подписки на основе `period`."""
+        self.period = period
+        self.reviewing = reviewing
+        self.error = error
+        self.max_interval = max_interval
+        self.jitter = jitter
+
+    def next_delay(self, subscription, changed=False, error=None):
+        """Задержка до следующего опроса с учётом исхода текущего."""
+        if error is not None:
+            subscription.failures += 1
+            delay = min(
+                self.error * 2 ** (subscription.failures - 1),
+                self.max_interval,
+            )
+            return max(self._jittered(delay), retry_after(error) or 0)
+        subscription.failures = 0
+        subscription.idle_polls = 0 if changed else subscription.idle_polls + 1
+        if 'reviewing' in subscription.statuses.values():
+            return self._jittered(self.reviewing)
+        backoff = min(subscription.idle_polls // POLL_IDLE_STEP, 16)
+        delay = self.period * 2 ** backoff
+        return self._jittered(min(delay, self.max_interval))
+
+    def _jittered(self, delay):
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
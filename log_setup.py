@@ -0,0 +1,106 @@
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+
+from collections import OrderedDict
+from logging.handlers import (QueueHandler, QueueListener,
+                              RotatingFileHandler, TimedRotatingFileHandler)
+from settings import (LOG_BACKUP_COUNT, LOG_FORMAT, LOG_MAX_BYTES,
+                      LOG_ROTATION, LOG_SAMPLE_BURST, LOG_SAMPLE_KEYS,
+                      LOG_SAMPLE_WINDOW)
+
+RECORD_FIELDS = frozenset(vars(
+    logging.LogRecord('', logging.INFO, '', 0, '', (), None)
+)) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Запись журнала одной JSON-строкой с полями из `extra`."""
+
+    def format(self, record):
+        """Сериализует запись в JSON."""
+        data = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_FIELDS:
+                data[key] = value
+        if record.exc_info:
+            data['exception'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Пропускает не больше `burst` однотипных записей за окно."""
+
+    def __init__(self, burst=LOG_SAMPLE_BURST, window=LOG_SAMPLE_WINDOW,
+                 max_keys=LOG_SAMPLE_KEYS):
+        """Окно `window` секунд; помнит не больше `max_keys` ключей."""
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.max_keys = max_keys
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        """False для записи сверх лимита окна."""
+        with self._lock:
+            return self._sample(record)
+
+    def _sample(self, record):
+        key = (record.name, record.levelno, record.msg)
+        now = time.monotonic()
+        started, count, suppressed = self._counters.get(key, (now, 0, 0))
+        if now - started >= self.window:
+            started, count = now, 0
+        if count >= self.burst:
+            self._counters[key] = (started, count, suppressed + 1)
+            return False
+        if suppressed:
+            record.suppressed = suppressed
+        self._counters[key] = (started, count + 1, 0)
+        self._counters.move_to_end(key)
+        if len(self._counters) > self.max_keys:
+            self._counters.popitem(last=False)
+        return True
+
+
+def file_handler(path):
+    """Файловый обработчик с ротацией по размеру или по времени."""
+    if LOG_ROTATION == 'time':
+        return TimedRotatingFileHandler(
+            path, when='midnight', backupCount=LOG_BACKUP_COUNT,
+            encoding='utf-8',
+        )
+    return RotatingFileHandler(
+        path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+        encoding='utf-8',
+    )
+
+
+def setup_logging(path, level):
+    """Неблокирующий журнал: очередь и поток записи в файл и stdout."""
+    records = queue.SimpleQueue()
+    json_handler = file_handler(path)
+    json_handler.setFormatter(JsonFormatter())
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener = QueueListener(
+        records, json_handler, stream_handler, respect_handler_level=True
+    )
+    queue_handler = QueueHandler(records)
+    queue_handler.addFilter(SamplingFilter())
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    listener.start()
+    return listener
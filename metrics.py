@@ -0,0 +1,312 @@
+import bisect
+import logging
+import threading
+import time
+
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30
+)
+DELAY_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 3600, 7200)
+
+
+def format_labels(names, values, extra=()):
+    """Метки в формате Prometheus: {name="value",...}."""
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(
+        '{}="{}"'.format(
+            name, str(value).replace('\\', r'\\').replace('"', r'\"')
+        )
+        for name, value in pairs
+    ) + '}'
+
+
+class Metric:
+    """Базовая метрика с метками и потокобезопасными значениями."""
+
+    kind = ''
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        """Метрика с метками `labelnames`, регистрируется в `registry`."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def labels(self, *values):
+        """Дочерняя метрика для набора значений меток."""
+        values = tuple(str(value) for value in values)
+        with self._lock:
+            child = self._children.get(values)
+            if child is None:
+                child = self._children[values] = self._new_child()
+            return child
+
+    def render(self):
+        """Строки метрики в текстовом формате Prometheus."""
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.kind}',
+        ]
+        with self._lock:
+            children = list(self._children.items())
+        if not children and not self.labelnames:
+            children = [((), self.labels())]
+        for values, child in children:
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _default(self):
+        return self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _render_child(self, values, child):
+        raise NotImplementedError
+
+
+class _Value:
+
+    __slots__ = ('value', 'function', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self.function = None
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set(self, value):
+        with self._lock:
+            self.value = value
+
+    def set_function(self, function):
+        self.function = function
+
+    def get(self):
+        if self.function is not None:
+            return self.function()
+        return self.value
+
+
+class Counter(Metric):
+    """Монотонный счётчик."""
+
+    kind = 'counter'
+
+    def inc(self, amount=1):
+        """Увеличивает счётчик без меток."""
+        self._default().inc(amount)
+
+    def _new_child(self):
+        return _Value()
+
+    def _render_child(self, values, child):
+        labels = format_labels(self.labelnames, values)
+        yield f'{self.name}{labels} {child.get()}'
+
+
+class Gauge(Counter):
+    """Текущее значение: задаётся явно или функцией при сборе."""
+
+    kind = 'gauge'
+
+    def set(self, value):
+        """Задаёт значение без меток."""
+        self._default().set(value)
+
+    def dec(self, amount=1):
+        """Уменьшает значение без меток."""
+        self._default().dec(amount)
+
+    def set_function(self, function):
+        """Значение будет вычисляться функцией при каждом сборе."""
+        self._default().set_function(function)
+
+
+class _Buckets:
+
+    __slots__ = ('bounds', 'counts', 'sum', '_lock')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(Metric):
+    """Гистограмма наблюдений по корзинам."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(),
+                 buckets=LATENCY_BUCKETS, registry=None):
+        """Гистограмма с границами корзин `buckets`."""
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value):
+        """Добавляет наблюдение без меток."""
+        self._default().observe(value)
+
+    def time(self):
+        """Контекстный менеджер, измеряющий длительность блока."""
+        return self._default().time()
+
+    def _new_child(self):
+        return _Buckets(self.buckets)
+
+    def _render_child(self, values, child):
+        with child._lock:
+            counts, total = list(child.counts), child.sum
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(float(bound))
+            labels = format_labels(self.labelnames, values, [('le', le)])
+            yield f'{self.name}_bucket{labels} {cumulative}'
+        labels = format_labels(self.labelnames, values)
+        yield f'{self.name}_sum{labels} {total}'
+        yield f'{self.name}_count{labels} {cumulative}'
+
+
+class MetricsRegistry:
+    """Набор метрик, отдаваемых на /metrics."""
+
+    def __init__(self):
+        """Пустой реестр метрик."""
+        self._metrics = []
+
+    def register(self, metric):
+        """Добавляет метрику в набор."""
+        self._metrics.append(metric)
+
+    def render(self):
+        """Все метрики в текстовом формате Prometheus."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Отдаёт метрики по GET /metrics."""
+
+    def do_GET(self):
+        """Текст метрик или 404 для других путей."""
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        body = self.server.registry.render().encode()
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Пишет журнал запросов в logging вместо stderr."""
+        logger.debug(format, *args)
+
+
+class MetricsServer:
+    """Локальный HTTP-сервер с эндпоинтом /metrics."""
+
+    def __init__(self, host, port, registry=None):
+        """Сервер метрик на `host`:`port`."""
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.server.daemon_threads = True
+        self.server.registry = registry if registry is not None else REGISTRY
+
+    @property
+    def port(self):
+        """Порт, на котором слушает сервер."""
+        return self.server.server_address[1]
+
+    def start(self):
+        """Запускает сервер в фоновом потоке."""
+        threading.Thread(
+            target=self.server.serve_forever, name='metrics', daemon=True
+        ).start()
+        logger.info('Метрики доступны на порту %s', self.port)
+
+    def stop(self):
+        """Останавливает сервер."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+REGISTRY = MetricsRegistry()
+
+API_LATENCY = Histogram(
+    'practicum_api_request_seconds', 'Время запроса к API Практикума'
+)
+API_CONNECTIONS = Gauge(
+    'practicum_api_connections', 'Соединения пула сессии API', ('kind',)
+)
+PARSE_TIME = Histogram(
+    'practicum_api_parse_seconds', 'Разбор и проверка ответа API'
+)
+CIRCUIT_STATE = Gauge(
+    'practicum_api_circuit_state',
+    'Предохранитель API: 0 замкнут, 1 полуоткрыт, 2 разомкнут',
+)
+STARTUP_TIME = Gauge(
+    'bot_startup_seconds', 'Время от старта воркера до первого опроса'
+)
+BACKFILLS = Counter(
+    'backfills_total', 'Загрузки истории новых подписок по исходу',
+    ('outcome',),
+)
+POLL_LAG = Histogram(
+    'poll_lag_seconds', 'Опоздание начала опроса относительно срока',
+    ('priority',),
+)
+POLLS = Counter('polls_total', 'Опросы подписок по исходу', ('outcome',))
+ERRORS = Counter('errors_total', 'Ошибки по этапу и типу', ('stage', 'type'))
+ERROR_ALERTS = Counter(
+    'error_alerts_total', 'Уведомления об ошибках: отправлены и подавлены',
+    ('outcome',),
+)
+QUEUE_DEPTH = Gauge('delivery_queue_depth', 'Сообщения в очереди отправки')
+TELEGRAM_LATENCY = Histogram(
+    'telegram_send_seconds', 'Время вызова sendMessage'
+)
+MESSAGES = Counter(
+    'telegram_messages_total', 'Отправки в Telegram по исходу', ('outcome',)
+)
+NOTIFICATION_DELAY = Histogram(
+    'notification_delay_seconds',
+    'Задержка от изменения статуса до доставки уведомления',
+    buckets=DELAY_BUCKETS,
+)
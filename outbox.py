@@ -0,0 +1,199 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+
+from functools import partial
+from settings import (OUTBOX_BATCH_SIZE, OUTBOX_COMMIT_INTERVAL,
+                      OUTBOX_MAX_ATTEMPTS, OUTBOX_RETENTION,
+                      OUTBOX_RETRY_INTERVAL, STATE_SYNCHRONOUS)
+
+logger = logging.getLogger(__name__)
+
+
+def message_key(subscription_key, record, chat_id, previous=None):
+    """Ключ идемпотентности: один переход статуса работы в один чат.
+
+    Переход определяется прошлым и новым статусом и временем изменения,
+    поэтому повторное ревью после доработки — новое сообщение.
+    """
+    raw = (f'{subscription_key}|{record.key}|{previous}|{record.status}|'
+           f'{record.date_updated}|{chat_id}')
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class Outbox:
+    """Журнал исходящих уведомлений в SQLite с отметками об отправке.
+
+    Переход статуса записывается до сдвига курсора, поэтому после сбоя
+    неотправленное досылается, а повторно найденный переход не
+    дублируется. Отметки об отправке копятся и пишутся пачками.
+    Неудачные отправки повторяются, пока не кончатся `max_attempts`.
+    """
+
+    def __init__(self, path, synchronous=STATE_SYNCHRONOUS,
+                 batch_size=OUTBOX_BATCH_SIZE,
+                 commit_interval=OUTBOX_COMMIT_INTERVAL,
+                 max_attempts=OUTBOX_MAX_ATTEMPTS):
+        """Открывает журнал и создаёт таблицу."""
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self.max_attempts = max_attempts
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(f'PRAGMA synchronous={synchronous}')
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS outbox ('
+                'id TEXT PRIMARY KEY, chat_id NOT NULL, '
+                'text TEXT NOT NULL, created_at REAL NOT NULL, '
+                'sent_at REAL, attempts INTEGER NOT NULL DEFAULT 0)'
+            )
+            columns = {
+                row[1] for row in
+                self.connection.execute('PRAGMA table_info(outbox)')
+            }
+            if 'attempts' not in columns:
+                self.connection.execute(
+                    'ALTER TABLE outbox '
+                    'ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0'
+                )
+            self.connection.execute(
+                'CREATE INDEX IF NOT EXISTS outbox_pending '
+                'ON outbox (created_at) WHERE sent_at IS NULL'
+            )
+        self._sent = []
+        self._queued = set()
+        self._committed_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def add(self, entries):
+        """Записывает (id, chat_id, text) одной транзакцией.
+
+        Возвращает только новые записи: уже известные id пропускаются.
+        """
+        fresh, now = [], time.time()
+        with self._lock, self.connection:
+            for message_id, chat_id, text in entries:
+                cursor = self.connection.execute(
+                    'INSERT OR IGNORE INTO outbox (id, chat_id, text, '
+                    'created_at) VALUES (?, ?, ?, ?)',
+                    (message_id, chat_id, text, now),
+                )
+                if cursor.rowcount:
+                    fresh.append((message_id, chat_id, text))
+        return fresh
+
+    def send(self, delivery, entries):
+        """Записывает сообщения и ставит в очередь только новые."""
+        return self._enqueue(delivery, self.add(entries))
+
+    def pending(self):
+        """Неотправленные сообщения с оставшимися попытками.
+
+        Сначала записывает накопленные отметки, иначе только что
+        доставленное выглядело бы неотправленным.
+        """
+        with self._lock:
+            self._commit()
+            return self.connection.execute(
+                'SELECT id, chat_id, text FROM outbox '
+                'WHERE sent_at IS NULL AND attempts < ? '
+                'ORDER BY created_at', (self.max_attempts,)
+            ).fetchall()
+
+    def redeliver(self, delivery):
+        """Повторно ставит в очередь неотправленное, кроме ждущего."""
+        pending = [
+            entry for entry in self.pending()
+            if entry[0] not in self._queued
+        ]
+        if pending:
+            logger.warning('Досылаем неотправленные уведомления: %s',
+                           len(pending))
+        return self._enqueue(delivery, pending)
+
+    def mark_sent(self, message_id):
+        """Отмечает сообщение отправленным; запись — пачкой."""
+        with self._lock:
+            self._sent.append((time.time(), message_id))
+            elapsed = time.monotonic() - self._committed_at
+            if (len(self._sent) >= self.batch_size
+                    or elapsed >= self.commit_interval):
+                self._commit()
+
+    def prune(self, retention=OUTBOX_RETENTION):
+        """Удаляет сообщения старше `retention` секунд.
+
+        Неотправленные тоже истекают: досылать их уже поздно.
+        """
+        with self._lock, self.connection:
+            self.connection.execute(
+                'DELETE FROM outbox WHERE COALESCE(sent_at, created_at) < ?',
+                (time.time() - retention,),
+            )
+
+    def start(self, delivery, interval=OUTBOX_RETRY_INTERVAL):
+        """Фоновая досылка неотправленного раз в `interval` секунд."""
+        self._thread = threading.Thread(
+            target=self._retry, args=(delivery, interval),
+            name='outbox', daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Останавливает фоновую досылку."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def close(self):
+        """Записывает накопленные отметки и закрывает базу."""
+        with self._lock:
+            self._commit()
+            self.connection.close()
+
+    def _enqueue(self, delivery, entries):
+        futures = delivery.enqueue_many(
+            [(chat_id, text) for _, chat_id, text in entries]
+        )
+        for (message_id, _, _), future in zip(entries, futures):
+            self._queued.add(message_id)
+            future.add_done_callback(partial(self._delivered, message_id))
+        return futures
+
+    def _delivered(self, message_id, future):
+        self._queued.discard(message_id)
+        if future.result():
+            self.mark_sent(message_id)
+            return
+        with self._lock, self.connection:
+            self.connection.execute(
+                'UPDATE outbox SET attempts = attempts + 1 WHERE id = ?',
+                (message_id,),
+            )
+            row = self.connection.execute(
+                'SELECT attempts FROM outbox WHERE id = ?', (message_id,)
+            ).fetchone()
+        if row and row[0] >= self.max_attempts:
+            logger.error('Уведомление %s не доставлено за %s попыток',
+                         message_id, row[0])
+
+    def _retry(self, delivery, interval):
+        while not self._stopped.wait(interval):
+            try:
+                self.redeliver(delivery)
+            except sqlite3.Error as error:
+                logger.error('Не удалось дослать уведомления: %s', error)
+
+    def _commit(self):
+        sent, self._sent = self._sent, []
+        self._committed_at = time.monotonic()
+        if sent:
+            with self.connection:
+                self.connection.executemany(
+                    'UPDATE outbox SET sent_at = ? WHERE id = ?', sent
+                )
@@ -0,0 +1,64 @@
+import hashlib
+import re
+
+from collections import OrderedDict
+from http import HTTPStatus
+from settings import RESPONSE_CACHE_SIZE
+
+# current_date меняется в каждом ответе, в отпечаток он не входит.
+CURRENT_DATE = re.compile(rb'"current_date"\s*:\s*[\d.]+')
+
+
+class ResponseCache:
+    """Отпечатки ответов API по токену и from_date: ETag и хэш тела."""
+
+    def __init__(self, max_size=RESPONSE_CACHE_SIZE):
+        """Кэш не больше `max_size` записей."""
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def request_headers(self, token, from_date):
+        """Заголовки условного запроса, если для ключа известен ETag."""
+        entry = self._lookup(token, from_date)
+        if entry is None or not entry[0]:
+            return {}
+        return {'If-None-Match': entry[0]}
+
+    @staticmethod
+    def fingerprint(response):
+        """Отпечаток (etag, digest) ответа или None для 304."""
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            return None
+        body = CURRENT_DATE.sub(b'', response.content or b'')
+        return response.headers.get('ETag'), hashlib.sha1(body).digest()
+
+    def is_unchanged(self, token, from_date, fingerprint):
+        """True, если ответ совпадает с уже обработанным."""
+        if fingerprint is None:
+            unchanged = True
+        else:
+            entry = self._lookup(token, from_date)
+            unchanged = entry is not None and entry[1] == fingerprint[1]
+        if unchanged:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return unchanged
+
+    def remember(self, token, from_date, fingerprint):
+        """Запоминает отпечаток успешно обработанного ответа."""
+        if fingerprint is None:
+            return
+        self._entries[token] = (from_date,) + fingerprint
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _lookup(self, token, from_date):
+        entry = self._entries.get(token)
+        if entry is None or entry[0] != from_date:
+            return None
+        self._entries.move_to_end(token)
+        return entry[1:]
@@ -0,0 +1,97 @@
+import heapq
+import itertools
+
+from metrics import POLL_LAG
+
+PRIORITY_CLASSES = ('high', 'reviewing', 'normal')
+
+
+def priority_of(subscription):
+    """Класс приоритета: явный у подписки, затем работы на ревью."""
+    if subscription.priority is not None:
+        return PRIORITY_CLASSES.index(subscription.priority)
+    if 'reviewing' in subscription.statuses.values():
+        return PRIORITY_CLASSES.index('reviewing')
+    return PRIORITY_CLASSES.index('normal')
+
+
+class PollScheduler:
+    """Очередь опросов на куче по времени и приоритету.
+
+    Перепланирование — O(log n): новая запись кладётся в кучу, а старая
+    помечается устаревшей через номер версии и выбрасывается при выборке.
+    """
+
+    def __init__(self, priority=priority_of):
+        """Пустая куча; `priority` определяет класс подписки."""
+        self.priority = priority
+        self._heap = []
+        self._versions = {}
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        """Число запланированных подписок."""
+        return len(self._versions)
+
+    def __contains__(self, subscription):
+        """Запланирована ли подписка."""
+        return subscription.token in self._versions
+
+    def schedule(self, subscription, at=None):
+        """Ставит (или переносит) опрос подписки на время `at`."""
+        if at is not None:
+            subscription.next_poll = at
+        version = next(self._sequence)
+        self._versions[subscription.token] = version
+        heapq.heappush(self._heap, (
+            subscription.next_poll, self.priority(subscription), version,
+            subscription,
+        ))
+        self._compact()
+
+    def remove(self, subscription):
+        """Убирает подписку из расписания."""
+        self._versions.pop(subscription.token, None)
+
+    def sync(self, registry, now=0.0):
+        """Добавляет новые подписки реестра и убирает удалённые.
+
+        Новые подписки ставятся не раньше `now`: их `next_poll` ещё 0.
+        """
+        current = {subscription.token for subscription in registry}
+        for token in list(self._versions):
+            if token not in current:
+                del self._versions[token]
+        for subscription in registry:
+            if subscription.token not in self._versions:
+                self.schedule(
+                    subscription, max(subscription.next_poll, now)
+                )
+
+    def pop_due(self, now):
+        """Подписки, которые пора опросить: раньше срок, выше приоритет."""
+        due, heap = [], self._heap
+        while heap and heap[0][0] <= now:
+            at, priority, version, subscription = heapq.heappop(heap)
+            if self._versions.get(subscription.token) != version:
+                continue
+            del self._versions[subscription.token]
+            POLL_LAG.labels(PRIORITY_CLASSES[priority]).observe(now - at)
+            due.append((priority, at, version, subscription))
+        due.sort()
+        return [entry[3] for entry in due]
+
+    def next_due(self, default):
+        """Время ближайшего опроса или `default`, если опросов нет."""
+        heap = self._heap
+        while heap and self._versions.get(heap[0][3].token) != heap[0][2]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else default
+
+    def _compact(self):
+        if len(self._heap) > 2 * len(self._versions) + 1024:
+            self._heap = [
+                entry for entry in self._heap
+                if self._versions.get(entry[3].token) == entry[2]
+            ]
+            heapq.heapify(self._heap)
@@ -3,3 +3,88 @@ HOMEWORK_STATUSES = {
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
+STATUS_MESSAGE = 'Изменился статус проверки работы "{name}". {verdict}'
+UNKNOWN_STATUS_VERDICT = 'Новый статус работы: {status}.'
+DEFAULT_LANGUAGE = 'ru'
+TEMPLATE_DATE_FORMAT = '%d.%m.%Y %H:%M'
+
+POLL_CONCURRENCY = 100
+
+API_POOL_CONNECTIONS = 4
+API_POOL_MAXSIZE = POLL_CONCURRENCY
+API_CONNECT_TIMEOUT = 5
+API_READ_TIMEOUT = 30
+
+API_BULKHEAD_SIZE = 50
+API_BULKHEAD_TIMEOUT = 5
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 60
+CIRCUIT_HALF_OPEN_CALLS = 1
+
+TOKEN_DISABLE_INTERVAL = 24 * 60 * 60
+
+RESPONSE_CACHE_SIZE = 100_000
+
+STATE_BACKEND = 'sqlite'
+STATE_PATH = 'bot_state.sqlite3'
+STATE_BATCH_SIZE = 500
+STATE_FLUSH_INTERVAL = 5
+STATE_SYNCHRONOUS = 'NORMAL'
+
+BACKFILL_WORKERS = 4
+BACKFILL_FROM_DATE = 1
+
+EVENTS_PATH = 'events.sqlite3'
+EVENTS_BATCH_SIZE = 500
+EVENTS_FLUSH_INTERVAL = 5
+
+OUTBOX_PATH = 'outbox.sqlite3'
+OUTBOX_BATCH_SIZE = 500
+OUTBOX_COMMIT_INTERVAL = 1
+OUTBOX_RETENTION = 7 * 24 * 60 * 60
+OUTBOX_RETRY_INTERVAL = 5 * 60
+OUTBOX_MAX_ATTEMPTS = 5
+
+STATUS_INDEX_SIZE = 256
+
+DELIVERY_WORKERS = 4
+DELIVERY_GLOBAL_RATE = 30
+DELIVERY_CHAT_RATE = 1
+DELIVERY_MAX_ATTEMPTS = 5
+DELIVERY_BACKOFF = 1
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+POLL_REVIEWING_INTERVAL = 120
+POLL_ERROR_INTERVAL = 30
+POLL_MAX_INTERVAL = 3600
+POLL_IDLE_STEP = 6
+POLL_JITTER = 0.1
+
+ERROR_ALERT_WINDOW = 3600
+ERROR_ALERT_CACHE_SIZE = 1024
+ERROR_ALERT_FLUSH_INTERVAL = 60
+
+WEBHOOK_HOST = '0.0.0.0'
+WEBHOOK_PORT = 8443
+
+LOG_FILE = 'main.log'
+LOG_LEVEL = 'INFO'
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_ROTATION = 'size'
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+LOG_SAMPLE_BURST = 20
+LOG_SAMPLE_WINDOW = 60
+LOG_SAMPLE_KEYS = 1024
+
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = 9100
+
+SHUTDOWN_TIMEOUT = 30
+
+SHARD_COUNT = 256
+SHARD_REPLICAS = 64
+SHARD_LEASE_TTL = 60
+SHARD_DB = 'shards.sqlite3'
+SHARD_SUPERVISE_INTERVAL = 5
+SUBSCRIPTIONS_WATCH_INTERVAL = 5
@@ -0,0 +1,165 @@
+import bisect
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+
+from contextlib import contextmanager
+from settings import SHARD_COUNT, SHARD_LEASE_TTL, SHARD_REPLICAS
+
+logger = logging.getLogger(__name__)
+
+
+def hash_point(value):
+    """Точка на кольце для строки."""
+    return int(hashlib.sha1(value.encode()).hexdigest()[:15], 16)
+
+
+def shard_of(key, shards=SHARD_COUNT):
+    """Номер шарда для ключа подписки."""
+    return hash_point(key) % shards
+
+
+class HashRing:
+    """Консистентное хеширование с виртуальными узлами."""
+
+    def __init__(self, nodes=(), replicas=SHARD_REPLICAS):
+        """Кольцо из `replicas` точек на узел."""
+        ring = sorted(
+            (hash_point(f'{node}#{replica}'), node)
+            for node in nodes for replica in range(replicas)
+        )
+        self._points = [point for point, _ in ring]
+        self._nodes = [node for _, node in ring]
+
+    def node_for(self, key):
+        """Узел, которому принадлежит ключ, или None для пустого кольца."""
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, hash_point(key))
+        return self._nodes[index % len(self._nodes)]
+
+
+class LeaseCoordinator:
+    """Аренда шардов подписок воркерами через общую базу SQLite."""
+
+    def __init__(self, path, worker_id, shards=SHARD_COUNT,
+                 ttl=SHARD_LEASE_TTL, on_acquire=None, on_release=None):
+        """Подключается к базе аренды `path`."""
+        self.worker_id = worker_id
+        self.shards = shards
+        self.ttl = ttl
+        self.on_acquire = on_acquire
+        self.on_release = on_release
+        self._owned = {}
+        self._stopped = threading.Event()
+        self._thread = None
+        self.connection = sqlite3.connect(
+            path, timeout=ttl, isolation_level=None, check_same_thread=False
+        )
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS workers ('
+            'worker TEXT PRIMARY KEY, expires REAL NOT NULL)'
+        )
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS leases ('
+            'shard INTEGER PRIMARY KEY, worker TEXT NOT NULL, '
+            'expires REAL NOT NULL)'
+        )
+
+    def owns(self, subscription):
+        """True, если шард подписки арендован этим воркером."""
+        expires = self._owned.get(shard_of(subscription.key, self.shards))
+        return expires is not None and expires > time.monotonic()
+
+    def owned_shards(self):
+        """Шарды с действующей арендой."""
+        now = time.monotonic()
+        return {shard for shard, expires in self._owned.items()
+                if expires > now}
+
+    def rebalance(self):
+        """Продлевает аренду, забирает свои и отпускает чужие шарды."""
+        started = time.monotonic()
+        now = time.time()
+        with self._transaction() as cursor:
+            cursor.execute(
+                'INSERT OR REPLACE INTO workers VALUES (?, ?)',
+                (self.worker_id, now + self.ttl),
+            )
+            cursor.execute('DELETE FROM workers WHERE expires < ?', (now,))
+            workers = cursor.execute('SELECT worker FROM workers')
+            ring = HashRing(worker for worker, in workers.fetchall())
+            wanted = [
+                shard for shard in range(self.shards)
+                if ring.node_for(str(shard)) == self.worker_id
+            ]
+            cursor.executemany(
+                'INSERT INTO leases VALUES (?, ?, ?) '
+                'ON CONFLICT (shard) DO UPDATE SET '
+                'worker = excluded.worker, expires = excluded.expires '
+                'WHERE leases.worker = excluded.worker OR leases.expires < ?',
+                ((shard, self.worker_id, now + self.ttl, now)
+                 for shard in wanted),
+            )
+            held = {
+                shard for shard, in cursor.execute(
+                    'SELECT shard FROM leases WHERE worker = ? '
+                    'AND expires >= ?', (self.worker_id, now),
+                )
+            }
+        # Отпущенные шарды не продлеваются и освобождаются по истечении
+        # аренды: к этому времени опросы старого владельца завершены.
+        owned = held.intersection(wanted)
+        acquired = owned - self.owned_shards()
+        if acquired and self.on_acquire is not None:
+            self.on_acquire(acquired)
+        expires = started + self.ttl * 0.75
+        previous = set(self._owned)
+        self._owned = dict.fromkeys(owned, expires)
+        released = previous - set(self._owned)
+        if released and self.on_release is not None:
+            self.on_release(released)
+        return self.owned_shards()
+
+    def start(self):
+        """Первое распределение и фоновое продление аренды."""
+        self.rebalance()
+        self._thread = threading.Thread(
+            target=self._heartbeat, name='shard-leases', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Останавливает продление и сразу освобождает свои шарды."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._owned = {}
+        with self._transaction() as cursor:
+            cursor.execute(
+                'DELETE FROM leases WHERE worker = ?', (self.worker_id,)
+            )
+            cursor.execute(
+                'DELETE FROM workers WHERE worker = ?', (self.worker_id,)
+            )
+        self.connection.close()
+
+    def _heartbeat(self):
+        while not self._stopped.wait(self.ttl / 4):
+            try:
+                self.rebalance()
+            except sqlite3.Error as error:
+                logger.error('Не удалось продлить аренду шардов: %s', error)
+
+    @contextmanager
+    def _transaction(self):
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield self.connection.cursor()
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+        self.connection.execute('COMMIT')
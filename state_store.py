@@ -0,0 +1,191 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from settings import (STATE_BATCH_SIZE, STATE_FLUSH_INTERVAL,
+                      STATE_SYNCHRONOUS)
+
+
+class StateStore:
+    """Буферизованное хранилище курсоров и последних статусов подписок."""
+
+    def __init__(self, batch_size=STATE_BATCH_SIZE,
+                 flush_interval=STATE_FLUSH_INTERVAL):
+        """Буфер записей до `batch_size` или `flush_interval`."""
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._cursors = {}
+        self._statuses = {}
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+
+    def set_cursor(self, key, current_date):
+        """Сохраняет курсор `current_date` подписки."""
+        with self._lock:
+            self._cursors[key] = current_date
+        self._maybe_flush()
+
+    def set_status(self, key, homework, status):
+        """Сохраняет последний отправленный статус работы."""
+        with self._lock:
+            self._statuses[(key, homework)] = status
+        self._maybe_flush()
+
+    def restore(self, registry):
+        """Восстанавливает курсоры и статусы подписок реестра."""
+        with self._lock:
+            cursors, statuses = self.load()
+        for subscription in registry:
+            subscription.current_date = cursors.get(
+                subscription.key, subscription.current_date
+            )
+            subscription.statuses.update(statuses.get(subscription.key, {}))
+
+    def flush(self):
+        """Записывает накопленные изменения одной пачкой."""
+        with self._lock:
+            cursors, self._cursors = self._cursors, {}
+            statuses, self._statuses = self._statuses, {}
+            self._flushed_at = time.monotonic()
+            if cursors or statuses:
+                self._write(cursors, statuses)
+
+    def close(self):
+        """Сбрасывает буфер и закрывает хранилище."""
+        self.flush()
+
+    def load(self):
+        """Курсоры {key: date} и статусы {key: {homework: status}}."""
+        raise NotImplementedError
+
+    def _write(self, cursors, statuses):
+        raise NotImplementedError
+
+    def _maybe_flush(self):
+        pending = len(self._cursors) + len(self._statuses)
+        elapsed = time.monotonic() - self._flushed_at
+        if pending >= self.batch_size or elapsed >= self.flush_interval:
+            self.flush()
+
+
+class SQLiteStateStore(StateStore):
+    """Хранилище состояния в SQLite."""
+
+    def __init__(self, path, synchronous=STATE_SYNCHRONOUS, **kwargs):
+        """Открывает базу состояния и создаёт таблицы."""
+        super().__init__(**kwargs)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(f'PRAGMA synchronous={synchronous}')
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS cursors ('
+                'key TEXT PRIMARY KEY, from_date INTEGER NOT NULL)'
+            )
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS statuses ('
+                'key TEXT NOT NULL, homework TEXT NOT NULL, '
+                'status TEXT NOT NULL, PRIMARY KEY (key, homework))'
+            )
+
+    def load(self):
+        """Курсоры {key: date} и статусы {key: {homework: status}}."""
+        cursors = dict(
+            self.connection.execute('SELECT key, from_date FROM cursors')
+        )
+        statuses = {}
+        rows = self.connection.execute(
+            'SELECT key, homework, status FROM statuses'
+        )
+        for key, homework, status in rows:
+            statuses.setdefault(key, {})[homework] = status
+        return cursors, statuses
+
+    def close(self):
+        """Сбрасывает буфер и закрывает соединение."""
+        super().close()
+        self.connection.close()
+
+    def _write(self, cursors, statuses):
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO cursors VALUES (?, ?)',
+                cursors.items(),
+            )
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO statuses VALUES (?, ?, ?)',
+                ((key, hw, status) for (key, hw), status in statuses.items()),
+            )
+
+
+class LogStateStore(StateStore):
+    """Хранилище состояния в виде журнала JSON-строк только на запись."""
+
+    def __init__(self, path, fsync=False, **kwargs):
+        """Журнал состояния в файле `path`."""
+        super().__init__(**kwargs)
+        self.path = path
+        self.fsync = fsync
+        self._compact()
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def load(self):
+        """Курсоры {key: date} и статусы {key: {homework: status}}."""
+        cursors, statuses = {}, {}
+        if not os.path.exists(self.path):
+            return cursors, statuses
+        with open(self.path, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if 'c' in record:
+                    cursors[record['k']] = record['c']
+                else:
+                    statuses.setdefault(record['k'], {})[record['h']] = (
+                        record['s']
+                    )
+        return cursors, statuses
+
+    def close(self):
+        """Сбрасывает буфер и закрывает журнал."""
+        super().close()
+        self.file.close()
+
+    def _write(self, cursors, statuses):
+        lines = [
+            json.dumps({'k': key, 'c': date}) for key, date in cursors.items()
+        ]
+        lines.extend(
+            json.dumps({'k': key, 'h': homework, 's': status})
+            for (key, homework), status in statuses.items()
+        )
+        self.file.write('\n'.join(lines) + '\n')
+        self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+
+    def _compact(self):
+        cursors, statuses = self.load()
+        if not cursors and not statuses:
+            return
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as self.file:
+            self._write(cursors, {
+                (key, homework): status
+                for key, homework_statuses in statuses.items()
+                for homework, status in homework_statuses.items()
+            })
+            os.fsync(self.file.fileno())
+        os.replace(temp_path, self.path)
+
+
+def open_state_store(backend, path, **kwargs):
+    """Создаёт хранилище состояния: 'sqlite' или 'log'."""
+    backends = {'sqlite': SQLiteStateStore, 'log': LogStateStore}
+    if backend not in backends:
+        raise ValueError(f'Неизвестное хранилище состояния: {backend}')
+    return backends[backend](path, **kwargs)
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import threading
+
+from homework_diff import StatusIndex
+from scheduler import PRIORITY_CLASSES
+
+
+def subscription_key(token):
+    """Идентификатор подписки без раскрытия токена."""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def auth_headers(token):
+    """Заголовки запроса к API для токена Практикума."""
+    return {'Authorization': f'OAuth {token}'}
+
+
+class Subscription:
+    """Подписка: токен Практикума и чаты, куда отправлять уведомления."""
+
+    __slots__ = (
+        'token', 'key', 'chat_ids', 'current_date', 'statuses', 'next_poll',
+        'idle_polls', 'failures', 'headers', 'disabled_until', 'priority',
+    )
+
+    def __init__(self, token, chat_ids=(), current_date=0):
+        """Подписка токена на чаты `chat_ids`."""
+        self.token = token
+        self.key = subscription_key(token)
+        self.chat_ids = list(dict.fromkeys(chat_ids))
+        self.current_date = current_date
+        self.statuses = StatusIndex()
+        self.next_poll = 0.0
+        self.idle_polls = 0
+        self.failures = 0
+        self.headers = auth_headers(token)
+        self.disabled_until = 0.0
+        self.priority = None
+
+
+class SubscriptionRegistry:
+    """Реестр подписок: токен -> чаты, курсор и последние статусы."""
+
+    def __init__(self):
+        """Пустой реестр."""
+        self._subscriptions = {}
+        self._chats = {}
+        self._languages = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        """Число подписок."""
+        return len(self._subscriptions)
+
+    def __iter__(self):
+        """Снимок подписок для обхода без блокировки."""
+        with self._lock:
+            return iter(list(self._subscriptions.values()))
+
+    def get(self, token):
+        """Подписка по токену или None."""
+        return self._subscriptions.get(token)
+
+    def for_chat(self, chat_id):
+        """Подписки, на которые подписан чат."""
+        with self._lock:
+            return [
+                self._subscriptions[token]
+                for token in self._chats.get(chat_id, ())
+            ]
+
+    def language(self, chat_id):
+        """Язык уведомлений чата или None для языка по умолчанию."""
+        return self._languages.get(chat_id)
+
+    def set_language(self, chat_id, language):
+        """Задаёт язык уведомлений чата."""
+        with self._lock:
+            self._languages[chat_id] = language
+
+    def subscribe(self, token, chat_id):
+        """Добавляет чат к подписке токена, создавая её при необходимости."""
+        with self._lock:
+            subscription = self._subscriptions.get(token)
+            if subscription is None:
+                subscription = Subscription(token)
+                self._subscriptions[token] = subscription
+            if chat_id not in subscription.chat_ids:
+                subscription.chat_ids.append(chat_id)
+                self._chats.setdefault(chat_id, set()).add(token)
+            return subscription
+
+    def unsubscribe(self, token, chat_id):
+        """Убирает чат из подписки, пустые подписки удаляются."""
+        with self._lock:
+            subscription = self._subscriptions.get(token)
+            if subscription is None:
+                return
+            if chat_id in subscription.chat_ids:
+                subscription.chat_ids.remove(chat_id)
+                tokens = self._chats[chat_id]
+                tokens.discard(token)
+                if not tokens:
+                    del self._chats[chat_id]
+                    self._languages.pop(chat_id, None)
+            if not subscription.chat_ids:
+                del self._subscriptions[token]
+
+    def replace(self, other):
+        """Приводит подписки к `other`, сохраняя состояние оставшихся.
+
+        Возвращает новые подписки, которым нужно восстановить состояние.
+        """
+        with self._lock:
+            for subscription in list(self._subscriptions.values()):
+                wanted = other.get(subscription.token)
+                for chat_id in list(subscription.chat_ids):
+                    if wanted is None or chat_id not in wanted.chat_ids:
+                        self.unsubscribe(subscription.token, chat_id)
+            added = [
+                subscription.token for subscription in other
+                if subscription.token not in self._subscriptions
+            ]
+            for subscription in other:
+                for chat_id in subscription.chat_ids:
+                    self.subscribe(subscription.token, chat_id)
+                self._subscriptions[subscription.token].priority = (
+                    subscription.priority
+                )
+            self._languages = dict(other._languages)
+            return [self._subscriptions[token] for token in added]
+
+    def spread(self, period, now):
+        """Равномерно распределяет первые опросы по окну `period`."""
+        with self._lock:
+            count = len(self._subscriptions)
+            for index, subscription in enumerate(
+                self._subscriptions.values()
+            ):
+                subscription.next_poll = now + period * index / count
+
+    @classmethod
+    def from_file(cls, path):
+        """Загружает реестр из JSON вида {"токен": [chat_id, ...]}.
+
+        Вместо chat_id можно указать {"chat_id": ..., "language": ...},
+        вместо списка — {"chats": [...], "priority": "high"}.
+        """
+        registry = cls()
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+        for token, entry in data.items():
+            chats, priority = entry, None
+            if isinstance(entry, dict):
+                chats, priority = entry['chats'], entry.get('priority')
+                if priority is not None and priority not in PRIORITY_CLASSES:
+                    raise ValueError(f'Неизвестный приоритет: {priority}')
+            for chat in chats:
+                if isinstance(chat, dict):
+                    registry.set_language(chat['chat_id'], chat['language'])
+                    chat = chat['chat_id']
+                registry.subscribe(token, chat).priority = priority
+        return registry
+
+    def to_file(self, path):
+        """Атомарно сохраняет реестр в JSON для `from_file`."""
+        with self._lock:
+            data = {
+                token: self._subscription_entry(subscription)
+                for token, subscription in self._subscriptions.items()
+            }
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+        os.replace(temp_path, path)
+
+    def _subscription_entry(self, subscription):
+        chats = [
+            self._chat_entry(chat_id) for chat_id in subscription.chat_ids
+        ]
+        if subscription.priority is None:
+            return chats
+        return {'chats': chats, 'priority': subscription.priority}
+
+    def _chat_entry(self, chat_id):
+        language = self._languages.get(chat_id)
+        if language is None:
+            return chat_id
+        return {'chat_id': chat_id, 'language': language}
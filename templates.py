@@ -0,0 +1,152 @@
+import json
+
+from datetime import datetime
+from settings import (DEFAULT_LANGUAGE, HOMEWORK_STATUSES, STATUS_MESSAGE,
+                      TEMPLATE_DATE_FORMAT, UNKNOWN_STATUS_VERDICT)
+from string import Formatter
+
+FIELDS = (
+    'name', 'status', 'verdict', 'lesson_name', 'reviewer_comment', 'date',
+)
+DEFAULT_TEMPLATES = {
+    'ru': {
+        'message': STATUS_MESSAGE,
+        'verdicts': HOMEWORK_STATUSES,
+        'fallback': UNKNOWN_STATUS_VERDICT,
+    },
+    'en': {
+        'message': 'Review status of "{name}" has changed. {verdict}',
+        'verdicts': {
+            'approved': 'The reviewer approved your work. Hooray!',
+            'reviewing': 'A reviewer has started checking your work.',
+            'rejected': 'The reviewer left some comments on your work.',
+        },
+        'fallback': 'New status: {status}.',
+    },
+}
+
+
+class Template:
+    """Шаблон, разобранный один раз на литералы и имена полей."""
+
+    __slots__ = ('parts',)
+
+    def __init__(self, parts):
+        """Шаблон из разобранных частей, см. `compile`."""
+        self.parts = parts
+
+    @classmethod
+    def compile(cls, source):
+        """Разбирает строку формата; ValueError для неизвестных полей."""
+        parts = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if literal:
+                parts.append((literal, None))
+            if field is None:
+                continue
+            if field not in FIELDS or spec or conversion:
+                raise ValueError(f'Недопустимое поле шаблона: {{{field}}}')
+            parts.append(('', field))
+        return cls(parts)
+
+    def bind(self, **values):
+        """Новый шаблон с подставленными заранее полями."""
+        parts = []
+        for literal, field in self.parts:
+            value = values.get(field)
+            if isinstance(value, Template):
+                parts.extend(value.parts)
+            elif value is not None:
+                parts.append((value, None))
+            else:
+                parts.append((literal, field))
+        return Template(self._merged(parts))
+
+    def render(self, values):
+        """Текст шаблона для значений полей."""
+        return ''.join([
+            literal if field is None else values[field]
+            for literal, field in self.parts
+        ])
+
+    @staticmethod
+    def _merged(parts):
+        merged = []
+        for literal, field in parts:
+            if field is None and merged and merged[-1][1] is None:
+                merged[-1] = (merged[-1][0] + literal, None)
+            else:
+                merged.append((literal, field))
+        return merged
+
+
+def format_date(value):
+    """Дата из date_updated API в формате TEMPLATE_DATE_FORMAT."""
+    try:
+        parsed = datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ')
+    except (TypeError, ValueError):
+        return value or ''
+    return parsed.strftime(TEMPLATE_DATE_FORMAT)
+
+
+class MessageTemplates:
+    """Скомпилированные шаблоны уведомлений по языкам и статусам."""
+
+    def __init__(self, templates=None, default_language=DEFAULT_LANGUAGE):
+        """Шаблоны по языкам; `default_language` обязателен."""
+        templates = dict(templates or DEFAULT_TEMPLATES)
+        if default_language not in templates:
+            raise ValueError(f'Нет шаблонов для языка {default_language}')
+        self.default_language = default_language
+        self._messages = {}
+        self._fallbacks = {}
+        for language, config in templates.items():
+            message = Template.compile(config['message'])
+            for status, verdict in config['verdicts'].items():
+                self._messages[language, status] = message.bind(
+                    status=status, verdict=Template.compile(verdict)
+                )
+            self._fallbacks[language] = message.bind(
+                verdict=Template.compile(config['fallback'])
+            )
+
+    @property
+    def languages(self):
+        """Языки, для которых есть шаблоны."""
+        return tuple(self._fallbacks)
+
+    def render(self, record, language=None, strict=False):
+        """Текст уведомления; неизвестный статус — по шаблону fallback."""
+        if language not in self._fallbacks:
+            language = self.default_language
+        template = self._messages.get((language, record.status))
+        if template is None:
+            if strict:
+                raise KeyError(f'Статус работы не распознан: {record.status}')
+            template = self._fallbacks[language]
+        return template.render({
+            'name': record.name,
+            'status': record.status,
+            'lesson_name': record.lesson_name or '',
+            'reviewer_comment': record.reviewer_comment or '',
+            'date': format_date(record.date_updated),
+        })
+
+    @classmethod
+    def from_file(cls, path, default_language=DEFAULT_LANGUAGE):
+        """Шаблоны из JSON поверх встроенных, по языкам.
+
+        Вердикты дополняют встроенные по статусам, а не заменяют их целиком.
+        """
+        with open(path, encoding='utf-8') as file:
+            custom = json.load(file)
+        templates = {
+            language: dict(config)
+            for language, config in DEFAULT_TEMPLATES.items()
+        }
+        for language, config in custom.items():
+            base = templates.get(language, templates[default_language])
+            verdicts = dict(base['verdicts'], **config.get('verdicts', {}))
+            templates[language] = dict(base, **config)
+            templates[language]['verdicts'] = verdicts
+        return cls(templates, default_language)
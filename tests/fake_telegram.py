@@ -0,0 +1,38 @@
+import json
+from urllib.request import Request, urlopen
+
+
+class FakeTelegram:
+    """Stand-in for Telegram: pushes updates to the webhook, records bot calls."""
+
+    def __init__(self, webhook_url):
+        self.webhook_url = webhook_url
+        self.update_id = 0
+        self.webhooks = []
+        self.sent = []
+
+    def set_webhook(self, url=None, **kwargs):
+        self.webhooks.append(url)
+        return True
+
+    def send_message(self, chat_id, text, **kwargs):
+        self.sent.append((chat_id, text))
+
+    def send_update(self, chat_id, text):
+        """Posts a message update and returns the webhook reply, if any."""
+        self.update_id += 1
+        update = {
+            'update_id': self.update_id,
+            'message': {
+                'message_id': self.update_id,
+                'chat': {'id': chat_id, 'type': 'private'},
+                'text': text,
+            },
+        }
+        request = Request(
+            self.webhook_url, data=json.dumps(update).encode(),
+            headers={'Content-Type': 'application/json'},
+        )
+        with urlopen(request, timeout=5) as response:
+            body = response.read()
+        return json.loads(body) if body else None
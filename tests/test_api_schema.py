@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from api_schema import HomeworkRecord, decode_answer
+
+
+class TestApiSchema:
+
+    def test_decode_answer_builds_records(self):
+        content = json.dumps({
+            'homeworks': [{
+                'id': 7, 'homework_name': 'hw7', 'status': 'approved',
+                'lesson_name': 'Итоговый проект',
+                'date_updated': '2022-01-01T10:00:00Z',
+            }],
+            'current_date': 1000,
+        }).encode()
+        answer = decode_answer(content)
+        record, = answer.homeworks
+        assert (record.key, record.name, record.status) == (
+            '7', 'hw7', 'approved'
+        ), 'Проверьте, что записи строятся из ответа API'
+        assert record.lesson_name == 'Итоговый проект'
+        assert answer.current_date == 1000
+
+    def test_decode_answer_skips_malformed_records(self):
+        content = json.dumps({
+            'homeworks': [
+                {'homework_name': 'hw1', 'status': 'approved'},
+                {'homework_name': 'hw2'},
+                'hw3',
+            ],
+            'current_date': 1000,
+        })
+        answer = decode_answer(content)
+        assert [record.name for record in answer.homeworks] == ['hw1'], (
+            'Проверьте, что некорректные работы пропускаются'
+        )
+        assert answer.skipped == 2
+
+    @pytest.mark.parametrize('content', ['[]', '{"homeworks": {}}'])
+    def test_decode_answer_rejects_wrong_structure(self, content):
+        with pytest.raises(TypeError):
+            decode_answer(content)
+
+    def test_decode_answer_requires_current_date(self):
+        content = '{"homeworks": [{"homework_name": "hw", "status": "x"}]}'
+        with pytest.raises(KeyError):
+            decode_answer(content)
+
+    def test_from_dict_requires_status(self):
+        with pytest.raises(KeyError, match='status'):
+            HomeworkRecord.from_dict({'homework_name': 'hw'})
@@ -0,0 +1,34 @@
+import requests
+
+from api_session import PooledSession
+
+
+class TestPooledSession:
+
+    def test_default_timeout(self, monkeypatch):
+        captured = {}
+
+        def mock_request(session, method, url, **kwargs):
+            captured.update(kwargs)
+
+        monkeypatch.setattr(requests.Session, 'request', mock_request)
+        session = PooledSession(timeout=(1, 2))
+        session.get('https://example.com/')
+        assert captured['timeout'] == (1, 2), (
+            'Проверьте, что запросы по умолчанию выполняются с таймаутом'
+        )
+        session.get('https://example.com/', timeout=7)
+        assert captured['timeout'] == 7
+
+    def test_pool_limits_and_stats(self):
+        session = PooledSession(pool_connections=2, pool_maxsize=5)
+        pool = session.adapter.poolmanager.connection_from_url(
+            'https://example.com/'
+        )
+        assert pool.pool.maxsize == 5, (
+            'Проверьте, что размер пула на хост задаётся настройкой'
+        )
+        pool.num_connections, pool.num_requests = 2, 10
+        assert session.stats() == {
+            'requests': 10, 'connections': 2, 'reused': 8
+        }
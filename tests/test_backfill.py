@@ -0,0 +1,79 @@
+import threading
+import time
+
+from api_schema import ApiAnswer, HomeworkRecord
+from backfill import Backfill
+from subscriptions import Subscription
+
+
+class FakeStore:
+
+    def __init__(self):
+        self.cursors = {}
+        self.statuses = {}
+
+    def set_cursor(self, key, current_date):
+        self.cursors[key] = current_date
+
+    def set_status(self, key, homework, status):
+        self.statuses[key, homework] = status
+
+
+class TestBackfill:
+
+    def test_history_is_stored_without_notifications(self):
+        answer = ApiAnswer([
+            HomeworkRecord('1', 'hw1', 'approved'),
+            HomeworkRecord('1', 'hw1', 'reviewing'),
+            HomeworkRecord('2', 'hw2', 'rejected'),
+        ], 1000)
+        store = FakeStore()
+        backfill = Backfill(lambda subscription, from_date: answer, store)
+        subscription = Subscription('token')
+        assert not backfill.admits(subscription), (
+            'Проверьте, что новая подписка не опрашивается до загрузки'
+        )
+        backfill.stop()
+        assert dict(subscription.statuses) == {
+            '1': 'approved', '2': 'rejected'
+        }
+        assert store.cursors == {subscription.key: 1000}
+        assert backfill.admits(subscription)
+
+    def test_pool_is_bounded(self):
+        active = {'now': 0, 'max': 0}
+        lock = threading.Lock()
+
+        def fetch(subscription, from_date):
+            assert from_date == 1
+            with lock:
+                active['now'] += 1
+                active['max'] = max(active['max'], active['now'])
+            time.sleep(0.01)
+            with lock:
+                active['now'] -= 1
+            return ApiAnswer([HomeworkRecord('1', 'hw', 'approved')], 10)
+
+        backfill = Backfill(fetch, FakeStore(), workers=3)
+        subscriptions = [Subscription(f'token-{i}') for i in range(20)]
+        assert backfill.run(subscriptions) == 20
+        backfill.stop()
+        assert active['max'] <= 3, (
+            'Проверьте, что загрузка истории идёт в ограниченном пуле'
+        )
+
+    def test_failed_backfill_is_retried(self):
+        calls = []
+
+        def fetch(subscription, from_date):
+            calls.append(from_date)
+            raise ConnectionError('boom')
+
+        backfill = Backfill(fetch, FakeStore(), workers=1)
+        subscription = Subscription('token')
+        backfill.submit(subscription).result()
+        assert subscription.current_date == 0
+        assert len(backfill) == 0
+        backfill.submit(subscription).result()
+        backfill.stop()
+        assert len(calls) == 2
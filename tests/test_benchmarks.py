@@ -0,0 +1,27 @@
+import logging
+
+from benchmarks.run import compare, run_scenario
+
+
+class TestBenchmarks:
+
+    def test_single_subscription_scenario(self):
+        logging.disable(logging.CRITICAL)
+        try:
+            result = run_scenario(subscriptions=1, period=0.05, duration=0.5)
+        finally:
+            logging.disable(logging.NOTSET)
+        assert result['polls_per_sec'] > 0, (
+            'Проверьте, что сценарий опрашивает фейковый API'
+        )
+        assert result['notifications_per_sec'] > 0, (
+            'Проверьте, что уведомления доходят до фейкового Telegram'
+        )
+        assert result['bytes_per_subscription'] > 0
+
+    def test_compare_detects_regressions(self):
+        baseline = {'single': {'polls_per_sec': 100, 'latency_p99': 1.0}}
+        results = {'single': {'polls_per_sec': 80, 'latency_p99': 1.05}}
+        regressions = compare(results, baseline, tolerance=0.1)
+        assert len(regressions) == 1
+        assert regressions[0].startswith('single.polls_per_sec')
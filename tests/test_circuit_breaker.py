@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+
+from circuit_breaker import (CLOSED, HALF_OPEN, OPEN, Bulkhead,
+                             BulkheadFullError, CircuitBreaker,
+                             CircuitOpenError)
+from intervals import retry_after
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fail():
+    raise ConnectionError('boom')
+
+
+class TestCircuitBreaker:
+
+    def make_breaker(self, clock, changes):
+        return CircuitBreaker(
+            'api', failure_threshold=3, reset_timeout=60, clock=clock,
+            is_failure=lambda status: status >= 500,
+            on_change=lambda breaker, old, new: changes.append((old, new)),
+        )
+
+    def test_opens_after_threshold_and_fails_fast(self):
+        clock, changes = FakeClock(), []
+        breaker = self.make_breaker(clock, changes)
+        breaker.call(lambda: 503)
+        with pytest.raises(ConnectionError):
+            breaker.call(fail)
+        breaker.call(lambda: 500)
+        assert breaker.state == OPEN, (
+            'Проверьте, что предохранитель размыкается после серии сбоев'
+        )
+        calls = []
+        clock.now = 20
+        with pytest.raises(CircuitOpenError) as error:
+            breaker.call(calls.append, 1)
+        assert calls == [], 'Проверьте, что при разомкнутой цепи нет запросов'
+        assert retry_after(error.value) == 40
+        assert changes == [(CLOSED, OPEN)]
+
+    def test_half_open_trial_closes_or_reopens(self):
+        clock, changes = FakeClock(), []
+        breaker = self.make_breaker(clock, changes)
+        for _ in range(3):
+            breaker.call(lambda: 500)
+        clock.now = 61
+        assert breaker.call(lambda: 500) == 500
+        assert breaker.state == OPEN, (
+            'Проверьте, что неудачная проба снова размыкает цепь'
+        )
+        clock.now = 122
+        breaker.call(lambda: 200)
+        assert breaker.state == CLOSED
+        assert changes == [
+            (CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, OPEN),
+            (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED),
+        ]
+
+    def test_half_open_allows_limited_trials(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker('api', failure_threshold=1, clock=clock)
+        with pytest.raises(ConnectionError):
+            breaker.call(fail)
+        clock.now = breaker.reset_timeout
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker('api', failure_threshold=2)
+        with pytest.raises(ConnectionError):
+            breaker.call(fail)
+        breaker.call(lambda: None)
+        with pytest.raises(ConnectionError):
+            breaker.call(fail)
+        assert breaker.state == CLOSED
+
+
+class TestBulkhead:
+
+    def test_rejects_when_all_slots_are_busy(self):
+        bulkhead = Bulkhead('api', size=1, timeout=0.01)
+        entered, release = threading.Event(), threading.Event()
+
+        def hold():
+            with bulkhead:
+                entered.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        entered.wait()
+        with pytest.raises(BulkheadFullError):
+            with bulkhead:
+                pass
+        release.set()
+        thread.join()
+        with bulkhead:
+            pass
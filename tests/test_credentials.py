@@ -0,0 +1,104 @@
+import asyncio
+from functools import partial
+
+import pytest
+
+import homework
+from backfill import Backfill
+from credentials import (TOKEN_REJECTED, CredentialProvider,
+                         InvalidTokenError)
+from intervals import retry_after
+from response_cache import ResponseCache
+from subscriptions import Subscription
+
+
+class FakeResponse:
+    status_code = 401
+
+
+class FakeDelivery:
+
+    def __init__(self):
+        self.messages = []
+
+    def enqueue_many(self, messages):
+        self.messages.extend(messages)
+        return []
+
+
+class FakeFanOut:
+
+    def __init__(self):
+        self.delivery = FakeDelivery()
+
+
+class TestCredentials:
+
+    def test_headers_are_cached_per_subscription(self):
+        subscription = Subscription('token')
+        assert subscription.headers is subscription.headers
+        assert subscription.headers == {'Authorization': 'OAuth token'}
+
+    def test_rejected_token_is_disabled(self):
+        credentials = CredentialProvider(disable_interval=3600)
+        subscription = Subscription('token')
+        credentials.check(subscription, 100)
+        assert not credentials.reject(subscription, 100)
+        with pytest.raises(InvalidTokenError) as error:
+            credentials.check(subscription, 200)
+        assert retry_after(error.value) == 3500, (
+            'Проверьте, что отключённый токен не опрашивается до срока'
+        )
+        credentials.check(subscription, 3700)
+
+    def test_rejected_token_is_refreshed(self):
+        credentials = CredentialProvider(refresh=lambda subscription: 'new')
+        subscription = Subscription('old')
+        assert credentials.reject(subscription, 100)
+        assert subscription.headers == {'Authorization': 'OAuth new'}
+        credentials.check(subscription, 100)
+
+    def test_poll_with_revoked_token(self, monkeypatch):
+        calls = []
+
+        async def request_api_async(headers, from_date):
+            calls.append(headers)
+            return FakeResponse()
+
+        monkeypatch.setattr(homework, 'request_api_async', request_api_async)
+        subscription = Subscription('token', chat_ids=[1, 2])
+        fanout, credentials = FakeFanOut(), CredentialProvider()
+        for _ in range(2):
+            with pytest.raises(InvalidTokenError):
+                asyncio.run(homework.poll_subscription(
+                    fanout, ResponseCache(), None, credentials, subscription
+                ))
+        assert len(calls) == 1, (
+            'Проверьте, что отозванный токен не запрашивается повторно'
+        )
+        assert fanout.delivery.messages == [
+            (1, TOKEN_REJECTED), (2, TOKEN_REJECTED)
+        ]
+
+    def test_backfill_with_revoked_token(self, monkeypatch):
+        calls = []
+
+        def request_api(headers, from_date):
+            calls.append(headers)
+            return FakeResponse()
+
+        monkeypatch.setattr(homework, 'request_api', request_api)
+        subscription = Subscription('token', chat_ids=[1])
+        fanout, credentials = FakeFanOut(), CredentialProvider()
+        backfill = Backfill(
+            partial(homework.fetch_history, fanout, credentials), None
+        )
+        for _ in range(2):
+            assert backfill.submit(subscription).result() == 0
+        backfill.stop()
+        assert len(calls) == 1, (
+            'Проверьте, что при загрузке истории отозванный токен '
+            'отключается'
+        )
+        assert fanout.delivery.messages == [(1, TOKEN_REJECTED)]
+        assert subscription.current_date == 0
@@ -0,0 +1,111 @@
+import time
+
+from delivery import DeliveryQueue, TokenBucket
+from settings import TELEGRAM_MESSAGE_LIMIT
+from telegram.error import BadRequest, RetryAfter
+
+
+class FakeBot:
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.sent = []
+
+    def send_message(self, chat_id, text):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent.append((chat_id, text, time.monotonic()))
+
+
+class TestDeliveryQueue:
+
+    def test_messages_for_chat_are_coalesced(self):
+        bot = FakeBot()
+        queue = DeliveryQueue(bot, workers=2)
+        futures = [queue.enqueue(1, text) for text in ('a', 'b', 'c')]
+        futures.append(queue.enqueue(2, 'd'))
+        assert len(queue) == 4
+        queue.start()
+        assert all(future.result(timeout=5) for future in futures)
+        queue.stop()
+        assert sorted(sent[:2] for sent in bot.sent) == [
+            (1, 'a\n\nb\n\nc'), (2, 'd')
+        ], 'Проверьте, что сообщения в один чат склеиваются'
+
+    def test_enqueue_many_skips_pending_duplicates(self):
+        bot = FakeBot()
+        queue = DeliveryQueue(bot, workers=2)
+        futures = queue.enqueue_many([(1, 'a'), (2, 'a'), (1, 'a')])
+        assert futures[0] is futures[2], (
+            'Проверьте, что одинаковое сообщение в чат не дублируется'
+        )
+        assert len(queue) == 2
+        queue.start()
+        assert all(future.result(timeout=5) for future in futures)
+        queue.stop()
+        assert sorted(sent[:2] for sent in bot.sent) == [(1, 'a'), (2, 'a')]
+
+    def test_chat_rate_limit(self):
+        bot = FakeBot(errors=[RetryAfter(0.2)])
+        queue = DeliveryQueue(bot, workers=2, chat_rate=10)
+        queue.start()
+        first = queue.enqueue(1, 'a')
+        time.sleep(0.05)
+        second = queue.enqueue(1, 'b')
+        assert first.result(timeout=5) and second.result(timeout=5)
+        queue.stop()
+        assert [sent[1] for sent in bot.sent] == ['a', 'b']
+        assert bot.sent[1][2] - bot.sent[0][2] >= 0.1, (
+            'Проверьте, что лимит чата отсчитывается от фактической отправки'
+        )
+
+    def test_long_batch_chunks_are_spaced(self):
+        bot = FakeBot()
+        queue = DeliveryQueue(bot, workers=1, chat_rate=10)
+        futures = [
+            queue.enqueue(1, text * TELEGRAM_MESSAGE_LIMIT)
+            for text in 'ab'
+        ]
+        queue.start()
+        assert all(future.result(timeout=5) for future in futures)
+        queue.stop()
+        assert bot.sent[1][2] - bot.sent[0][2] >= 0.1, (
+            'Проверьте, что части длинной пачки отправляются с интервалом'
+        )
+
+    def test_unexpected_error_does_not_kill_worker(self):
+        bot = FakeBot(errors=[RuntimeError('boom')])
+        queue = DeliveryQueue(bot, workers=1)
+        queue.start()
+        assert queue.enqueue(1, 'a').result(timeout=5) is False, (
+            'Проверьте, что сбой отправки завершает Future с False'
+        )
+        assert queue.enqueue(2, 'b').result(timeout=5)
+        queue.stop()
+
+    def test_retry_after_is_honoured(self):
+        bot = FakeBot(errors=[RetryAfter(0)])
+        queue = DeliveryQueue(bot, workers=1)
+        queue.start()
+        assert queue.enqueue(1, 'a').result(timeout=5), (
+            'Проверьте, что после RetryAfter сообщение отправляется повторно'
+        )
+        queue.stop()
+        assert len(bot.sent) == 1
+
+    def test_bad_request_is_not_retried(self):
+        bot = FakeBot(errors=[BadRequest('chat not found')])
+        queue = DeliveryQueue(bot, workers=1)
+        queue.start()
+        assert not queue.enqueue(1, 'a').result(timeout=5)
+        queue.stop()
+        assert bot.sent == []
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0 < bucket.reserve() <= 0.1, (
+        'Проверьте, что сверх ёмкости ведра возвращается время ожидания'
+    )
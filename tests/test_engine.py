@@ -0,0 +1,87 @@
+import asyncio
+
+from engine import PollEngine
+from subscriptions import SubscriptionRegistry
+
+
+class TestPollEngine:
+
+    def test_concurrency_is_bounded(self):
+        registry = SubscriptionRegistry()
+        for index in range(20):
+            registry.subscribe(f'token-{index}', index)
+        polled = []
+        active = {'now': 0, 'max': 0}
+
+        async def poll(subscription):
+            active['now'] += 1
+            active['max'] = max(active['max'], active['now'])
+            await asyncio.sleep(0.01)
+            active['now'] -= 1
+            polled.append(subscription.token)
+            if len(polled) == len(registry):
+                engine.stop()
+
+        engine = PollEngine(registry, poll, period=0.01, concurrency=3)
+        asyncio.run(asyncio.wait_for(engine.run(), timeout=5))
+        assert len(set(polled)) == 20, (
+            'Проверьте, что движок опрашивает все подписки'
+        )
+        assert active['max'] <= 3, (
+            'Проверьте, что число одновременных опросов ограничено'
+        )
+
+    def test_poll_errors_do_not_stop_engine(self):
+        registry = SubscriptionRegistry()
+        registry.subscribe('token', 1)
+        calls = []
+
+        async def poll(subscription):
+            calls.append(subscription.token)
+            if len(calls) == 2:
+                engine.stop()
+            raise ValueError('boom')
+
+        errors = []
+        engine = PollEngine(
+            registry, poll, period=0.01, concurrency=1,
+            on_error=lambda subscription, error: errors.append(error),
+        )
+        asyncio.run(asyncio.wait_for(engine.run(), timeout=5))
+        assert len(calls) == 2, (
+            'Проверьте, что ошибка опроса не останавливает цикл'
+        )
+        assert [str(error) for error in errors] == ['boom', 'boom'], (
+            'Проверьте, что сбои опроса передаются в on_error'
+        )
+
+    def test_unowned_subscription_added_later_waits_a_period(self):
+        registry = SubscriptionRegistry()
+        registry.subscribe('owned', 1)
+        checks = []
+
+        def owns(subscription):
+            if subscription.token == 'other':
+                checks.append(subscription.next_poll)
+                return False
+            return True
+
+        async def poll(subscription):
+            if not registry.get('other'):
+                registry.subscribe('other', 2)
+                engine.wake()
+
+        async def main():
+            task = asyncio.ensure_future(engine.run())
+            await asyncio.sleep(0.3)
+            engine.stop()
+            await task
+
+        engine = PollEngine(
+            registry, poll, period=0.1, concurrency=1, owns=owns
+        )
+        asyncio.run(asyncio.wait_for(main(), timeout=5))
+        assert 1 <= len(checks) <= 4, (
+            'Проверьте, что чужая новая подписка откладывается на период, '
+            'а не проверяется в цикле без пауз'
+        )
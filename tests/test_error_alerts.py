@@ -0,0 +1,64 @@
+from error_alerts import ErrorAlerts, fingerprint
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def raise_error(message):
+    try:
+        raise ConnectionError(message)
+    except ConnectionError as error:
+        return error
+
+
+class TestErrorAlerts:
+
+    def test_fingerprint_ignores_volatile_parts(self):
+        assert fingerprint(raise_error('timeout after 30 s')) == fingerprint(
+            raise_error('timeout after 45 s')
+        ), 'Проверьте, что числа не влияют на отпечаток ошибки'
+        assert fingerprint(raise_error('timeout')) != fingerprint(
+            ValueError('timeout')
+        )
+
+    def test_repeats_are_summarised(self):
+        clock, sent = FakeClock(), []
+        alerts = ErrorAlerts(sent.append, window=3600, clock=clock)
+        for attempt in range(5):
+            alerts.report(raise_error(f'HTTP {500 + attempt}'))
+        assert sent == ['Сбой в работе программы: HTTP 500'], (
+            'Проверьте, что повторы ошибки не отправляются сразу'
+        )
+        clock.now = 3600
+        alerts.flush()
+        assert sent[1:] == [
+            'Сбой повторился ещё 4 раз за последние 60 мин: HTTP 500'
+        ], 'Проверьте, что после окна отправляется сводка'
+        assert len(alerts) == 0
+
+    def test_cache_is_bounded(self):
+        sent = []
+        alerts = ErrorAlerts(sent.append, max_size=2, clock=FakeClock())
+        for name in ('a', 'b', 'a', 'c', 'd'):
+            alerts.report(ValueError(name))
+        assert len(alerts) == 2, (
+            'Проверьте, что число запомненных ошибок ограничено'
+        )
+        assert 'Сбой повторился ещё 1 раз за последние 60 мин: a' in sent
+
+    def test_stop_flushes_pending_summaries(self):
+        sent = []
+        alerts = ErrorAlerts(sent.append, flush_interval=3600)
+        alerts.start()
+        alerts.report(ValueError('boom'))
+        alerts.report(ValueError('boom'))
+        alerts.stop()
+        assert sent[-1] == (
+            'Сбой повторился ещё 1 раз за последние 60 мин: boom'
+        )
@@ -0,0 +1,89 @@
+import time
+
+from api_schema import HomeworkRecord
+from events import EventLog, main
+from subscriptions import subscription_key
+
+
+def record(status, lesson='Спринт 1', key='1'):
+    return HomeworkRecord(key, f'hw{key}', status, lesson_name=lesson)
+
+
+class TestEventLog:
+
+    def make_log(self, tmp_path):
+        events = EventLog(str(tmp_path / 'events.sqlite3'), batch_size=2)
+        subscriber = subscription_key('token')
+        events.append(100, subscriber, record('reviewing'))
+        events.append(3700, subscriber, record('rejected'), 'reviewing')
+        events.append(4000, subscriber, record('reviewing'), 'rejected')
+        events.append(4000 + 7200, subscriber, record('approved'),
+                      'reviewing')
+        events.append(500, 'other', record('reviewing', 'Спринт 2', '2'))
+        events.append(2300, 'other', record('approved', 'Спринт 2', '2'),
+                      'reviewing')
+        return events
+
+    def test_query_by_index_and_period(self, tmp_path):
+        events = self.make_log(tmp_path)
+        history = events.query(subscriber=subscription_key('token'))
+        assert [row[5] for row in history] == [
+            'reviewing', 'rejected', 'reviewing', 'approved'
+        ], 'Проверьте, что история подписчика упорядочена по времени'
+        assert len(events.query(status='approved', since=3000)) == 1
+        assert len(events.query(homework='2', until=1000)) == 1
+        plan = events.connection.execute(
+            'EXPLAIN QUERY PLAN SELECT * FROM events '
+            'WHERE subscriber = ? AND at >= ?', ('x', 0)
+        ).fetchall()
+        assert 'events_subscriber' in str(plan), (
+            'Проверьте, что выборка по подписчику идёт по индексу'
+        )
+        events.close()
+
+    def test_review_times(self, tmp_path):
+        events = self.make_log(tmp_path)
+        assert events.review_times() == [
+            ('Спринт 1', 2, 5400.0), ('Спринт 2', 1, 1800.0)
+        ], 'Проверьте расчёт среднего времени ревью по урокам'
+        events.close()
+
+    def test_failed_write_keeps_buffer(self, tmp_path):
+        events = EventLog(str(tmp_path / 'events.sqlite3'))
+        events.append(100, 'token', record('reviewing'))
+        events.connection.execute('ALTER TABLE events RENAME TO moved')
+        events.flush()
+        events.connection.execute('ALTER TABLE moved RENAME TO events')
+        assert len(events.query()) == 1, (
+            'Проверьте, что при ошибке записи события не теряются'
+        )
+        events.close()
+
+    def test_background_flush(self, tmp_path):
+        path = str(tmp_path / 'events.sqlite3')
+        events = EventLog(path, batch_size=2)
+        events.start()
+        events.append(100, 'token', record('reviewing'))
+        events.append(200, 'token', record('approved'), 'reviewing')
+        reader = EventLog(path)
+        for _ in range(50):
+            if len(reader.query()) == 2:
+                break
+            time.sleep(0.01)
+        assert len(reader.query()) == 2, (
+            'Проверьте, что заполненный буфер пишется фоновым потоком'
+        )
+        reader.close()
+        events.close()
+
+    def test_cli(self, tmp_path, capsys):
+        self.make_log(tmp_path).close()
+        db = str(tmp_path / 'events.sqlite3')
+        assert main(['--db', db, 'history', '--token', 'token',
+                     '--status', 'approved']) == 0
+        output = capsys.readouterr().out
+        assert output == (
+            '1970-01-01T03:06:40+00:00\thw1\treviewing -> approved\n'
+        )
+        main(['--db', db, '--since', '1970-01-01T00:10:00', 'review-time'])
+        assert capsys.readouterr().out == 'Спринт 1\t1\t2.0 ч\n'
@@ -0,0 +1,57 @@
+from api_schema import HomeworkRecord
+from fanout import FanOut, RoutingRules
+from subscriptions import SubscriptionRegistry
+from templates import MessageTemplates
+
+
+class FakeDelivery:
+
+    def __init__(self):
+        self.batches = []
+
+    def enqueue_many(self, messages):
+        self.batches.append(messages)
+        return []
+
+
+class CountingTemplates(MessageTemplates):
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def render(self, record, language=None, strict=False):
+        self.calls += 1
+        return super().render(record, language, strict)
+
+
+class TestFanOut:
+
+    def test_renders_once_per_language_and_applies_rules(self):
+        registry = SubscriptionRegistry()
+        for chat_id in range(1, 101):
+            subscription = registry.subscribe('token', chat_id)
+        registry.set_language(2, 'en')
+        rules = RoutingRules({'3': {'statuses': ['approved']}})
+        delivery, templates = FakeDelivery(), CountingTemplates()
+        fanout = FanOut(delivery, templates, registry, rules)
+        fanout.publish(
+            subscription, HomeworkRecord('1', 'hw', 'reviewing')
+        )
+        messages, = delivery.batches
+        assert len(messages) == 99, (
+            'Проверьте, что правила маршрутизации фильтруют получателей'
+        )
+        assert 3 not in dict(messages)
+        assert templates.calls == 2, (
+            'Проверьте, что текст рендерится один раз на язык'
+        )
+        assert dict(messages)[2].startswith('Review status')
+
+    def test_rules_by_lesson(self):
+        rules = RoutingRules({7: {'lessons': ['Спринт 1']}})
+        assert rules.allows(7, HomeworkRecord(
+            '1', 'hw', 'approved', lesson_name='Спринт 1'
+        ))
+        assert not rules.allows(7, HomeworkRecord('2', 'hw', 'approved'))
+        assert rules.allows(8, HomeworkRecord('2', 'hw', 'approved'))
@@ -0,0 +1,24 @@
+import os
+
+from file_watcher import FileWatcher
+
+
+class TestFileWatcher:
+
+    def test_change_is_detected_once(self, tmp_path):
+        path = tmp_path / 'subscriptions.json'
+        path.write_text('{}')
+        changes = []
+        watcher = FileWatcher(str(path), lambda: changes.append(True))
+        assert not watcher.check(), (
+            'Проверьте, что неизменённый файл не перечитывается'
+        )
+        path.write_text('{"token": [1]}')
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1))
+        assert watcher.check()
+        assert not watcher.check()
+        assert changes == [True]
+
+    def test_missing_file_is_ignored(self, tmp_path):
+        watcher = FileWatcher(str(tmp_path / 'missing.json'), None)
+        assert not watcher.check()
@@ -0,0 +1,36 @@
+from api_schema import HomeworkRecord
+from homework_diff import StatusIndex
+
+
+class TestStatusIndex:
+
+    def test_diff_returns_only_transitions(self):
+        index = StatusIndex()
+        index['1'] = 'reviewing'
+        index['hw2'] = 'approved'
+        records = [HomeworkRecord.from_dict(homework) for homework in (
+            {'id': 1, 'homework_name': 'hw1', 'status': 'approved'},
+            {'homework_name': 'hw2', 'status': 'approved'},
+            {'id': 3, 'homework_name': 'hw3', 'status': 'reviewing'},
+        )]
+        changed = index.diff(records)
+        assert [record.key for record in changed] == ['1', '3'], (
+            'Проверьте, что обрабатываются все изменившиеся работы из ответа'
+        )
+
+    def test_diff_keeps_first_entry_per_homework(self):
+        index = StatusIndex()
+        records = [
+            HomeworkRecord('1', 'hw1', 'approved'),
+            HomeworkRecord('1', 'hw1', 'reviewing'),
+        ]
+        assert index.diff(records) == [records[0]]
+
+    def test_size_is_bounded(self):
+        index = StatusIndex(max_size=2)
+        index.update({'a': 'approved', 'b': 'approved'})
+        index['a'] = 'rejected'
+        index['c'] = 'reviewing'
+        assert list(index) == ['a', 'c'], (
+            'Проверьте, что индекс вытесняет давно не менявшиеся работы'
+        )
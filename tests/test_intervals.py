@@ -0,0 +1,63 @@
+import requests
+
+from intervals import AdaptiveInterval, retry_after
+from subscriptions import Subscription
+
+
+class FakeResponse:
+
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class TestAdaptiveInterval:
+
+    def test_reviewing_is_polled_more_often(self):
+        interval = AdaptiveInterval(600, reviewing=60, jitter=0)
+        subscription = Subscription('token')
+        assert interval.next_delay(subscription, changed=True) == 600
+        subscription.statuses['1'] = 'reviewing'
+        assert interval.next_delay(subscription, changed=True) == 60, (
+            'Проверьте, что работы на ревью опрашиваются чаще'
+        )
+
+    def test_idle_backoff_is_capped(self):
+        interval = AdaptiveInterval(600, max_interval=3600, jitter=0)
+        subscription = Subscription('token')
+        delays = [interval.next_delay(subscription) for _ in range(30)]
+        assert delays[0] == 600
+        assert delays[-1] == 3600, (
+            'Проверьте, что интервал тихой подписки растёт до предела'
+        )
+        assert delays == sorted(delays)
+
+    def test_errors_back_off_and_honour_retry_after(self):
+        interval = AdaptiveInterval(600, error=30, jitter=0)
+        subscription = Subscription('token')
+        error = requests.ConnectionError(500)
+        assert interval.next_delay(subscription, error=error) == 30
+        assert interval.next_delay(subscription, error=error) == 60
+        limited = requests.ConnectionError(
+            429, response=FakeResponse({'Retry-After': '900'})
+        )
+        assert interval.next_delay(subscription, error=limited) == 900, (
+            'Проверьте, что учитывается заголовок Retry-After'
+        )
+        interval.next_delay(subscription, changed=True)
+        assert subscription.failures == 0
+
+    def test_jitter(self):
+        interval = AdaptiveInterval(600, jitter=0.1)
+        delays = {interval.next_delay(Subscription('t')) for _ in range(20)}
+        assert len(delays) > 1
+        assert all(540 <= delay <= 660 for delay in delays)
+
+
+def test_retry_after_http_date():
+    error = requests.ConnectionError(
+        503, response=FakeResponse(
+            {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}
+        )
+    )
+    assert retry_after(error) == 0
+    assert retry_after(requests.ConnectionError()) is None
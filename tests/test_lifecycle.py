@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+import signal
+import time
+
+import homework
+from credentials import CredentialProvider
+from engine import PollEngine
+from fanout import FanOut
+from response_cache import ResponseCache
+from subscriptions import SubscriptionRegistry
+
+
+class FakeStore:
+
+    def __init__(self):
+        self.restored = []
+        self.cursors = {}
+
+    def restore(self, subscriptions):
+        self.restored.extend(subscriptions)
+
+    def set_cursor(self, key, current_date):
+        self.cursors[key] = current_date
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, content):
+        self.content = content
+
+
+class TestLifecycle:
+
+    def test_sigterm_drains_in_flight_polls(self):
+        registry = SubscriptionRegistry()
+        registry.subscribe('token', 1)
+        finished = []
+
+        async def poll(subscription):
+            os.kill(os.getpid(), signal.SIGTERM)
+            await asyncio.sleep(0.05)
+            finished.append(subscription.token)
+
+        engine = PollEngine(registry, poll, period=60, concurrency=1)
+        asyncio.run(asyncio.wait_for(
+            homework.serve(engine, lambda: None, time.monotonic()), timeout=5
+        ))
+        assert finished == ['token'], (
+            'Проверьте, что по SIGTERM начатые опросы завершаются'
+        )
+
+    def test_empty_first_poll_sets_cursor(self, monkeypatch):
+        dates = []
+
+        async def request_api_async(headers, from_date):
+            dates.append(from_date)
+            return FakeResponse(json.dumps(
+                {'homeworks': [], 'current_date': 1000 + len(dates)}
+            ).encode())
+
+        monkeypatch.setattr(homework, 'request_api_async', request_api_async)
+        registry = SubscriptionRegistry()
+        subscription = registry.subscribe('token', 1)
+        store = FakeStore()
+        fanout = FanOut(None, homework.TEMPLATES, registry)
+        for _ in range(3):
+            asyncio.run(homework.poll_subscription(
+                fanout, ResponseCache(), store, CredentialProvider(),
+                subscription
+            ))
+        assert dates == [0, 1001, 1001], (
+            'Проверьте, что пустой первый ответ сдвигает курсор, '
+            'а пустые последующие — нет'
+        )
+        assert store.cursors == {subscription.key: 1001}
+
+    def test_reload_keeps_webhook_subscriptions(self, monkeypatch):
+        monkeypatch.setattr(homework, 'SUBSCRIPTIONS_FILE', None)
+        monkeypatch.setattr(homework, 'WEBHOOK_URL', 'https://example.com')
+        registry = SubscriptionRegistry()
+        registry.subscribe('token', 1)
+        fanout = FanOut(None, homework.TEMPLATES, registry)
+        homework.reload_config(registry, FakeStore(), fanout, None)
+        assert registry.get('token').chat_ids == [1], (
+            'Проверьте, что подписки из вебхука не теряются при перезагрузке'
+        )
+
+    def test_reload_config(self, monkeypatch, tmp_path):
+        path = tmp_path / 'subscriptions.json'
+        path.write_text(json.dumps({'token-a': [1], 'token-b': [2]}))
+        monkeypatch.setattr(homework, 'SUBSCRIPTIONS_FILE', str(path))
+        monkeypatch.setattr(homework, 'PRACTICUM_TOKEN', None)
+        registry = homework.load_subscriptions()
+        registry.get('token-a').current_date = 100
+        path.write_text(json.dumps({'token-a': [1, 3], 'token-c': [4]}))
+        store, woken = FakeStore(), []
+        fanout = FanOut(None, homework.TEMPLATES, registry)
+
+        class Engine:
+            def wake(self):
+                woken.append(True)
+
+        homework.reload_config(registry, store, fanout, Engine())
+        assert registry.get('token-a').chat_ids == [1, 3]
+        assert registry.get('token-a').current_date == 100, (
+            'Проверьте, что при перезагрузке сохраняется состояние подписок'
+        )
+        assert registry.get('token-b') is None
+        assert [s.token for s in store.restored] == ['token-c']
+        assert woken == [True]
@@ -0,0 +1,42 @@
+import json
+import logging
+
+from log_setup import JsonFormatter, SamplingFilter
+
+
+def make_record(msg, *args, **extra):
+    record = logging.LogRecord(
+        'homework', logging.ERROR, __file__, 1, msg, args, None
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+class TestLogSetup:
+
+    def test_json_formatter(self):
+        record = make_record('Сбой: %s', 'timeout', subscription='abc')
+        data = json.loads(JsonFormatter().format(record))
+        assert data['message'] == 'Сбой: timeout'
+        assert data['level'] == 'ERROR'
+        assert data['subscription'] == 'abc', (
+            'Проверьте, что поля extra попадают в JSON-запись'
+        )
+
+    def test_sampling_filter(self):
+        sampler = SamplingFilter(burst=2, window=3600)
+        passed = [
+            sampler.filter(make_record('Сбой: %s', index))
+            for index in range(5)
+        ]
+        assert passed == [True, True, False, False, False], (
+            'Проверьте, что однотипные записи сверх лимита отбрасываются'
+        )
+        assert sampler.filter(make_record('Другое событие'))
+
+    def test_sampling_reports_suppressed(self):
+        sampler = SamplingFilter(burst=1, window=0)
+        sampler._counters[('homework', logging.ERROR, 'x')] = (0, 1, 3)
+        record = make_record('x')
+        assert sampler.filter(record)
+        assert record.suppressed == 3
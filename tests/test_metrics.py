@@ -0,0 +1,52 @@
+from urllib.request import urlopen
+
+from metrics import (Counter, Gauge, Histogram, MetricsRegistry,
+                     MetricsServer)
+
+
+class TestMetrics:
+
+    def test_counter_and_gauge(self):
+        registry = MetricsRegistry()
+        errors = Counter('errors_total', 'Ошибки', ('type',), registry)
+        errors.labels('TypeError').inc()
+        errors.labels('TypeError').inc(2)
+        depth = Gauge('queue_depth', 'Очередь', registry=registry)
+        depth.set_function(lambda: 7)
+        text = registry.render()
+        assert 'errors_total{type="TypeError"} 3' in text, (
+            'Проверьте, что счётчики с метками выводятся в формате Prometheus'
+        )
+        assert 'queue_depth 7' in text
+        assert '# TYPE queue_depth gauge' in text
+
+    def test_histogram(self):
+        registry = MetricsRegistry()
+        latency = Histogram(
+            'latency_seconds', 'Задержка', buckets=(0.1, 1), registry=registry
+        )
+        for value in (0.05, 0.5, 5):
+            latency.observe(value)
+        text = registry.render()
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1.0"} 2' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in text, (
+            'Проверьте, что корзины гистограммы накопительные'
+        )
+        assert 'latency_seconds_count 3' in text
+        assert 'latency_seconds_sum 5.55' in text
+
+    def test_metrics_endpoint(self):
+        registry = MetricsRegistry()
+        Counter('polls_total', 'Опросы', registry=registry).inc()
+        server = MetricsServer('127.0.0.1', 0, registry)
+        server.start()
+        try:
+            url = f'http://127.0.0.1:{server.port}/metrics'
+            with urlopen(url, timeout=5) as response:
+                body = response.read().decode()
+        finally:
+            server.stop()
+        assert 'polls_total 1' in body, (
+            'Проверьте, что метрики отдаются по /metrics'
+        )
@@ -0,0 +1,130 @@
+from concurrent.futures import Future
+
+from api_schema import HomeworkRecord
+from fanout import FanOut
+from outbox import Outbox, message_key
+from subscriptions import SubscriptionRegistry
+from templates import MessageTemplates
+
+
+class FakeDelivery:
+
+    def __init__(self, delivered=True):
+        self.delivered = delivered
+        self.messages = []
+
+    def enqueue_many(self, messages):
+        self.messages.extend(messages)
+        futures = []
+        for _ in messages:
+            future = Future()
+            future.set_result(self.delivered)
+            futures.append(future)
+        return futures
+
+
+class TestOutbox:
+
+    def test_transition_is_sent_once(self, tmp_path):
+        path = str(tmp_path / 'outbox.sqlite3')
+        registry = SubscriptionRegistry()
+        subscription = registry.subscribe('token', 1)
+        record = HomeworkRecord('1', 'hw', 'approved')
+        delivery = FakeDelivery()
+        outbox = Outbox(path, commit_interval=0)
+        fanout = FanOut(delivery, MessageTemplates(), registry, outbox=outbox)
+        fanout.publish(subscription, record)
+        fanout.publish(subscription, record)
+        assert len(delivery.messages) == 1, (
+            'Проверьте, что повторно найденный переход не отправляется'
+        )
+        outbox.close()
+        outbox = Outbox(path)
+        assert outbox.pending() == []
+        outbox.close()
+
+    def test_resubmission_cycle_is_notified(self, tmp_path):
+        registry = SubscriptionRegistry()
+        subscription = registry.subscribe('token', 1)
+        delivery = FakeDelivery()
+        outbox = Outbox(str(tmp_path / 'outbox.sqlite3'))
+        fanout = FanOut(delivery, MessageTemplates(), registry, outbox=outbox)
+        cycle = [
+            ('reviewing', '2022-01-01T10:00:00Z'),
+            ('rejected', '2022-01-02T10:00:00Z'),
+            ('reviewing', '2022-01-03T10:00:00Z'),
+            ('approved', '2022-01-04T10:00:00Z'),
+        ]
+        for status, date_updated in cycle:
+            fanout.publish(subscription, HomeworkRecord(
+                '1', 'hw', status, date_updated=date_updated
+            ))
+            subscription.statuses['1'] = status
+        assert len(delivery.messages) == 4, (
+            'Проверьте, что повторное ревью после доработки отправляется'
+        )
+        outbox.close()
+
+    def test_unsent_messages_are_redelivered(self, tmp_path):
+        path = str(tmp_path / 'outbox.sqlite3')
+        outbox = Outbox(path)
+        key = message_key('sub', HomeworkRecord('1', 'hw', 'approved'), 7)
+        outbox.send(FakeDelivery(delivered=False), [(key, 7, 'text')])
+        outbox.close()
+        outbox = Outbox(path, commit_interval=0)
+        delivery = FakeDelivery()
+        outbox.redeliver(delivery)
+        assert delivery.messages == [(7, 'text')], (
+            'Проверьте, что после перезапуска неотправленное досылается'
+        )
+        outbox.close()
+        assert Outbox(path).pending() == []
+
+    def test_redeliver_skips_buffered_sent_marks(self, tmp_path):
+        outbox = Outbox(str(tmp_path / 'outbox.sqlite3'))
+        delivery = FakeDelivery()
+        outbox.send(delivery, [
+            (str(chat_id), chat_id, 'text') for chat_id in (1, 2, 3)
+        ])
+        outbox.redeliver(delivery)
+        assert len(delivery.messages) == 3, (
+            'Проверьте, что доставленное не досылается повторно'
+        )
+        outbox.close()
+
+    def test_failing_message_is_given_up(self, tmp_path):
+        outbox = Outbox(str(tmp_path / 'outbox.sqlite3'), max_attempts=2)
+        delivery = FakeDelivery(delivered=False)
+        outbox.send(delivery, [('1', 7, 'text')])
+        outbox.redeliver(delivery)
+        outbox.redeliver(delivery)
+        assert len(delivery.messages) == 2, (
+            'Проверьте, что после `max_attempts` неудач отправка прекращается'
+        )
+        assert outbox.pending() == []
+        outbox.close()
+
+    def test_unsent_messages_expire(self, tmp_path):
+        outbox = Outbox(str(tmp_path / 'outbox.sqlite3'))
+        outbox.send(FakeDelivery(delivered=False), [('1', 7, 'text')])
+        outbox.prune(retention=-1)
+        assert outbox.pending() == [], (
+            'Проверьте, что `prune` удаляет и старые неотправленные сообщения'
+        )
+        outbox.close()
+
+    def test_sent_marks_are_committed_in_batches(self, tmp_path):
+        outbox = Outbox(
+            str(tmp_path / 'outbox.sqlite3'), batch_size=3,
+            commit_interval=3600,
+        )
+        outbox.send(FakeDelivery(), [
+            (str(index), index, 'text') for index in range(5)
+        ])
+        unsent, = outbox.connection.execute(
+            'SELECT COUNT(*) FROM outbox WHERE sent_at IS NULL'
+        ).fetchone()
+        assert unsent == 2, (
+            'Проверьте, что отметки об отправке пишутся пачками'
+        )
+        outbox.close()
@@ -0,0 +1,57 @@
+from http import HTTPStatus
+
+from response_cache import ResponseCache
+
+
+class FakeResponse:
+
+    def __init__(self, content=b'', status_code=HTTPStatus.OK, etag=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {'ETag': etag} if etag else {}
+
+
+class TestResponseCache:
+
+    def test_same_payload_is_unchanged(self):
+        cache = ResponseCache()
+        first = cache.fingerprint(
+            FakeResponse(b'{"homeworks": [], "current_date": 100}')
+        )
+        assert not cache.is_unchanged('token', 0, first)
+        cache.remember('token', 0, first)
+        second = cache.fingerprint(
+            FakeResponse(b'{"homeworks": [], "current_date": 200}')
+        )
+        assert cache.is_unchanged('token', 0, second), (
+            'Проверьте, что ответ, отличающийся только current_date, '
+            'считается неизменным'
+        )
+        assert not cache.is_unchanged('token', 100, second), (
+            'Проверьте, что ключ кэша учитывает from_date'
+        )
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_etag_and_not_modified(self):
+        cache = ResponseCache()
+        assert cache.request_headers('token', 0) == {}
+        fingerprint = cache.fingerprint(FakeResponse(b'{}', etag='"v1"'))
+        cache.remember('token', 0, fingerprint)
+        assert cache.request_headers('token', 0) == {
+            'If-None-Match': '"v1"'
+        }
+        not_modified = cache.fingerprint(
+            FakeResponse(status_code=HTTPStatus.NOT_MODIFIED)
+        )
+        assert cache.is_unchanged('token', 0, not_modified), (
+            'Проверьте, что ответ 304 не обрабатывается повторно'
+        )
+
+    def test_size_is_bounded(self):
+        cache = ResponseCache(max_size=2)
+        for token in ('a', 'b', 'c'):
+            cache.remember(token, 0, (None, token.encode()))
+        assert not cache.is_unchanged('a', 0, (None, b'a')), (
+            'Проверьте, что старые записи вытесняются из кэша'
+        )
+        assert cache.is_unchanged('c', 0, (None, b'c'))
@@ -0,0 +1,65 @@
+from metrics import POLL_LAG
+from scheduler import PollScheduler, priority_of
+from subscriptions import Subscription, SubscriptionRegistry
+
+
+class TestPollScheduler:
+
+    def test_due_polls_are_ordered_by_priority(self):
+        scheduler = PollScheduler()
+        normal, reviewing, paid = (
+            Subscription('normal'), Subscription('reviewing'),
+            Subscription('paid'),
+        )
+        reviewing.statuses['1'] = 'reviewing'
+        paid.priority = 'high'
+        scheduler.schedule(normal, 10)
+        scheduler.schedule(reviewing, 20)
+        scheduler.schedule(paid, 30)
+        assert [priority_of(s) for s in (paid, reviewing, normal)] == [0, 1, 2]
+        assert scheduler.pop_due(5) == []
+        assert scheduler.pop_due(30) == [paid, reviewing, normal], (
+            'Проверьте, что среди наступивших опросов первыми идут важные'
+        )
+        assert len(scheduler) == 0
+        assert scheduler.next_due(100) == 100
+
+    def test_reschedule_replaces_previous_entry(self):
+        scheduler = PollScheduler()
+        subscription = Subscription('token')
+        scheduler.schedule(subscription, 10)
+        scheduler.schedule(subscription, 50)
+        assert scheduler.next_due(0) == 50, (
+            'Проверьте, что устаревшие записи кучи пропускаются'
+        )
+        assert scheduler.pop_due(20) == []
+        assert scheduler.pop_due(50) == [subscription]
+
+    def test_heap_is_compacted(self):
+        scheduler = PollScheduler()
+        subscriptions = [Subscription(f'token-{i}') for i in range(10)]
+        for at in range(1000):
+            for subscription in subscriptions:
+                scheduler.schedule(subscription, at)
+        assert len(scheduler._heap) <= 2 * 10 + 1024 + 1
+
+    def test_sync_with_registry(self):
+        registry = SubscriptionRegistry()
+        registry.subscribe('a', 1)
+        registry.subscribe('b', 2)
+        scheduler = PollScheduler()
+        scheduler.sync(registry)
+        registry.unsubscribe('a', 1)
+        registry.subscribe('c', 3)
+        scheduler.sync(registry)
+        assert sorted(s.token for s in scheduler.pop_due(0)) == ['b', 'c']
+
+    def test_lag_is_observed_per_class(self):
+        scheduler = PollScheduler()
+        scheduler.schedule(Subscription('token'), 10)
+        child = POLL_LAG.labels('normal')
+        before = child.sum
+        scheduler.pop_due(12.5)
+        assert child.sum - before == 2.5, (
+            'Проверьте, что опоздание опроса учитывается по классу'
+        )
@@ -0,0 +1,92 @@
+import time
+from collections import Counter
+
+from sharding import HashRing, LeaseCoordinator, shard_of
+from subscriptions import Subscription
+
+
+class TestHashRing:
+
+    def test_keys_spread_and_move_minimally(self):
+        keys = [str(shard) for shard in range(256)]
+        before = HashRing(['a', 'b', 'c'])
+        after = HashRing(['a', 'b', 'c', 'd'])
+        owners = Counter(before.node_for(key) for key in keys)
+        assert set(owners) == {'a', 'b', 'c'}
+        moved = [
+            key for key in keys if before.node_for(key) != after.node_for(key)
+        ]
+        assert all(after.node_for(key) == 'd' for key in moved), (
+            'Проверьте, что при добавлении узла ключи уходят только к нему'
+        )
+        assert len(moved) < len(keys) / 2
+
+    def test_empty_ring(self):
+        assert HashRing().node_for('key') is None
+
+
+class TestLeaseCoordinator:
+
+    def test_each_shard_has_one_owner(self, tmp_path):
+        path = str(tmp_path / 'shards.sqlite3')
+        first = LeaseCoordinator(path, 'worker-1', shards=32, ttl=60)
+        second = LeaseCoordinator(path, 'worker-2', shards=32, ttl=60)
+        first.rebalance()
+        assert first.owned_shards() == set(range(32)), (
+            'Проверьте, что единственный воркер берёт все шарды'
+        )
+        second.rebalance()
+        first.rebalance()
+        second.rebalance()
+        assert not first.owned_shards() & second.owned_shards(), (
+            'Проверьте, что шард не арендуют два воркера одновременно'
+        )
+        assert not second.owned_shards(), (
+            'Проверьте, что чужие шарды забираются только после аренды'
+        )
+        second.stop()
+        first.stop()
+
+    def test_released_shards_are_reported(self, tmp_path):
+        path = str(tmp_path / 'shards.sqlite3')
+        released, acquired = [], []
+        first = LeaseCoordinator(
+            path, 'worker-1', shards=32, ttl=60,
+            on_acquire=acquired.append, on_release=released.append,
+        )
+        second = LeaseCoordinator(path, 'worker-2', shards=32, ttl=60)
+        first.rebalance()
+        second.rebalance()
+        first.rebalance()
+        assert released == [set(range(32)) - first.owned_shards()], (
+            'Проверьте, что воркер сообщает об отданных шардах'
+        )
+        first.rebalance()
+        assert acquired == [set(range(32))], (
+            'Проверьте, что отданные, но ещё арендованные шарды '
+            'не считаются полученными заново'
+        )
+        second.stop()
+        first.stop()
+
+    def test_shards_move_after_release_or_expiry(self, tmp_path):
+        path = str(tmp_path / 'shards.sqlite3')
+        first = LeaseCoordinator(path, 'worker-1', shards=16, ttl=0.2)
+        acquired = []
+        second = LeaseCoordinator(
+            path, 'worker-2', shards=16, ttl=0.2, on_acquire=acquired.append
+        )
+        first.rebalance()
+        second.rebalance()
+        time.sleep(0.3)
+        second.rebalance()
+        assert second.owned_shards() == set(range(16)), (
+            'Проверьте, что шарды упавшего воркера переходят живым'
+        )
+        assert acquired == [set(range(16))]
+        subscription = Subscription('token')
+        assert second.owns(subscription) is (
+            shard_of(subscription.key, 16) in second.owned_shards()
+        )
+        second.stop()
+        first.connection.close()
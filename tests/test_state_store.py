@@ -0,0 +1,48 @@
+import pytest
+
+from state_store import open_state_store
+from subscriptions import SubscriptionRegistry
+
+
+@pytest.mark.parametrize('backend', ['sqlite', 'log'])
+class TestStateStore:
+
+    def test_restore_after_reopen(self, tmp_path, backend):
+        path = str(tmp_path / 'state')
+        registry = SubscriptionRegistry()
+        subscription = registry.subscribe('token', 1)
+        store = open_state_store(backend, path)
+        store.set_cursor(subscription.key, 100)
+        store.set_cursor(subscription.key, 200)
+        store.set_status(subscription.key, 'hw1', 'reviewing')
+        store.set_status(subscription.key, 'hw1', 'approved')
+        store.close()
+
+        store = open_state_store(backend, path)
+        store.restore(registry)
+        store.close()
+        assert subscription.current_date == 200, (
+            'Проверьте, что курсор подписки восстанавливается после рестарта'
+        )
+        assert subscription.statuses == {'hw1': 'approved'}, (
+            'Проверьте, что последние статусы восстанавливаются'
+        )
+
+    def test_writes_are_batched(self, tmp_path, backend):
+        store = open_state_store(
+            backend, str(tmp_path / 'state'),
+            batch_size=3, flush_interval=3600
+        )
+        store.set_cursor('a', 1)
+        store.set_cursor('b', 1)
+        assert store.load() == ({}, {}), (
+            'Проверьте, что записи копятся до заполнения пачки'
+        )
+        store.set_status('a', 'hw', 'approved')
+        assert store.load() == ({'a': 1, 'b': 1}, {'a': {'hw': 'approved'}})
+        store.close()
+
+
+def test_unknown_backend(tmp_path):
+    with pytest.raises(ValueError):
+        open_state_store('redis', str(tmp_path / 'state'))
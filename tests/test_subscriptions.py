@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from subscriptions import SubscriptionRegistry
+
+
+class TestSubscriptions:
+
+    def test_subscribe_groups_chats_by_token(self):
+        registry = SubscriptionRegistry()
+        registry.subscribe('token-a', 1)
+        registry.subscribe('token-a', 2)
+        registry.subscribe('token-a', 2)
+        registry.subscribe('token-b', 1)
+        assert len(registry) == 2, (
+            'Проверьте, что подписки группируются по токену'
+        )
+        assert registry.get('token-a').chat_ids == [1, 2], (
+            'Проверьте, что чаты подписки не дублируются'
+        )
+
+    def test_unsubscribe_drops_empty_subscription(self):
+        registry = SubscriptionRegistry()
+        registry.subscribe('token-a', 1)
+        registry.unsubscribe('token-a', 1)
+        assert registry.get('token-a') is None, (
+            'Проверьте, что подписка без чатов удаляется из реестра'
+        )
+
+    def test_spread_over_period(self):
+        registry = SubscriptionRegistry()
+        for index in range(4):
+            registry.subscribe(f'token-{index}', index)
+        registry.spread(600, 1000)
+        assert [s.next_poll for s in registry] == [1000, 1150, 1300, 1450], (
+            'Проверьте, что опросы равномерно распределены по окну'
+        )
+
+    def test_from_file(self, tmp_path):
+        path = tmp_path / 'subscriptions.json'
+        path.write_text(json.dumps({'token-a': [1, 2], 'token-b': [3]}))
+        registry = SubscriptionRegistry.from_file(str(path))
+        assert registry.get('token-a').chat_ids == [1, 2]
+        assert registry.get('token-b').chat_ids == [3]
+
+    def test_priority_round_trip(self, tmp_path):
+        path = tmp_path / 'subscriptions.json'
+        path.write_text(json.dumps({
+            'token-a': {'chats': [1], 'priority': 'high'}, 'token-b': [2],
+        }))
+        registry = SubscriptionRegistry.from_file(str(path))
+        assert registry.get('token-a').priority == 'high', (
+            'Проверьте, что приоритет подписки читается из файла'
+        )
+        assert registry.get('token-b').priority is None
+        registry.to_file(str(path))
+        loaded = SubscriptionRegistry.from_file(str(path))
+        assert loaded.get('token-a').priority == 'high'
+        path.write_text(json.dumps({'token-a': {'chats': [1], 'priority': 1}}))
+        with pytest.raises(ValueError):
+            SubscriptionRegistry.from_file(str(path))
+
+    def test_languages_round_trip(self, tmp_path):
+        path = tmp_path / 'subscriptions.json'
+        path.write_text(json.dumps(
+            {'token-a': [1, {'chat_id': 2, 'language': 'en'}]}
+        ))
+        registry = SubscriptionRegistry.from_file(str(path))
+        assert registry.get('token-a').chat_ids == [1, 2]
+        assert registry.language(2) == 'en', (
+            'Проверьте, что язык чата загружается из файла'
+        )
+        registry.to_file(str(path))
+        assert json.loads(path.read_text()) == {
+            'token-a': [1, {'chat_id': 2, 'language': 'en'}]
+        }
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from api_schema import HomeworkRecord
+from templates import MessageTemplates, Template
+
+
+class TestTemplates:
+
+    def test_default_message(self):
+        record = HomeworkRecord('1', 'hw1', 'approved')
+        assert MessageTemplates().render(record) == (
+            'Изменился статус проверки работы "hw1". '
+            'Работа проверена: ревьюеру всё понравилось. Ура!'
+        )
+
+    def test_language_and_unknown_status_fallback(self):
+        templates = MessageTemplates()
+        record = HomeworkRecord('1', 'hw1', 'on_hold')
+        assert templates.render(record, 'en') == (
+            'Review status of "hw1" has changed. New status: on_hold.'
+        ), 'Проверьте, что для неизвестного статуса используется fallback'
+        assert templates.render(record, 'de').startswith('Изменился')
+        with pytest.raises(KeyError):
+            templates.render(record, strict=True)
+
+    def test_custom_templates_from_file(self, tmp_path):
+        path = tmp_path / 'templates.json'
+        path.write_text(json.dumps({'ru': {
+            'message': '{lesson_name}: {verdict} ({date})\n{reviewer_comment}'
+        }}))
+        templates = MessageTemplates.from_file(str(path))
+        record = HomeworkRecord(
+            '1', 'hw1', 'rejected', lesson_name='Спринт 6',
+            reviewer_comment='Поправьте тесты',
+            date_updated='2022-01-31T09:05:00Z',
+        )
+        assert templates.render(record) == (
+            'Спринт 6: Работа проверена: у ревьюера есть замечания. '
+            '(31.01.2022 09:05)\nПоправьте тесты'
+        ), 'Проверьте, что в шаблоне доступны поля работы'
+        assert templates.languages == ('ru', 'en')
+
+    def test_custom_verdicts_extend_defaults(self, tmp_path):
+        path = tmp_path / 'templates.json'
+        path.write_text(json.dumps({'ru': {'verdicts': {'approved': 'Ура!'}}}))
+        templates = MessageTemplates.from_file(str(path))
+        approved = HomeworkRecord('1', 'hw1', 'approved')
+        reviewing = HomeworkRecord('1', 'hw1', 'reviewing')
+        assert templates.render(approved).endswith('Ура!')
+        assert templates.render(reviewing, strict=True).endswith(
+            'Работа взята на проверку ревьюером.'
+        ), 'Проверьте, что свои вердикты не стирают встроенные'
+
+    def test_compile_rejects_unknown_fields(self):
+        with pytest.raises(ValueError):
+            Template.compile('{token}')
+
+    def test_bind_precomputes_known_fields(self):
+        template = Template.compile('"{name}" {verdict}').bind(verdict='ok')
+        assert template.parts == [('"', None), ('', 'name'), ('" ok', None)]
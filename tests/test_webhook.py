@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from fake_telegram import FakeTelegram
+from subscriptions import SubscriptionRegistry
+from webhook import WebhookServer
+
+
+@pytest.fixture
+def webhook(tmp_path):
+    registry = SubscriptionRegistry()
+    changes = []
+    server = WebhookServer(
+        registry, '127.0.0.1', 0, '/webhook/secret',
+        subscriptions_file=str(tmp_path / 'subscriptions.json'),
+        on_change=lambda: changes.append(True), languages=('ru', 'en'),
+    )
+    server.start()
+    telegram = FakeTelegram(
+        f'http://127.0.0.1:{server.port}/webhook/secret'
+    )
+    yield server, telegram, changes
+    server.stop()
+
+
+class TestWebhook:
+
+    def test_subscribe_and_unsubscribe(self, webhook, tmp_path):
+        server, telegram, changes = webhook
+        reply = telegram.send_update(42, '/subscribe practicum-token')
+        assert reply['method'] == 'sendMessage'
+        assert reply['chat_id'] == 42
+        assert server.registry.get('practicum-token').chat_ids == [42], (
+            'Проверьте, что команда /subscribe добавляет подписку'
+        )
+        saved = json.loads((tmp_path / 'subscriptions.json').read_text())
+        assert saved == {'practicum-token': [42]}, (
+            'Проверьте, что подписки сохраняются в файл'
+        )
+        telegram.send_update(42, '/unsubscribe')
+        assert server.registry.get('practicum-token') is None
+        assert len(changes) == 2, (
+            'Проверьте, что планировщик будится после изменения подписок'
+        )
+
+    def test_status(self, webhook):
+        server, telegram, _ = webhook
+        server.registry.subscribe('token', 7).statuses['123'] = 'approved'
+        reply = telegram.send_update(7, '/status')
+        assert reply['text'] == 'Работа 123: approved'
+
+    def test_language(self, webhook, tmp_path):
+        server, telegram, _ = webhook
+        telegram.send_update(5, '/subscribe token')
+        assert 'ru, en' in telegram.send_update(5, '/language de')['text']
+        telegram.send_update(5, '/language en')
+        assert server.registry.language(5) == 'en', (
+            'Проверьте, что команда /language меняет язык чата'
+        )
+        saved = json.loads((tmp_path / 'subscriptions.json').read_text())
+        assert saved == {'token': [{'chat_id': 5, 'language': 'en'}]}
+
+    def test_non_command_updates(self, webhook):
+        server, telegram, _ = webhook
+        assert server.handle_update({'update_id': 1}) is None
+        assert 'Команды бота' in telegram.send_update(1, 'привет')['text']
@@ -1,6 +1,8 @@
 from inspect import signature
 from types import ModuleType
 
+import requests
+
 
 def check_function(scope: ModuleType, func_name: str, params_qty: int = 0):
     """Checks if scope has a function with specific name and params with qty"""
@@ -37,3 +39,16 @@ def check_default_var_exists(scope: ModuleType, var_name: str) -> None:
         f'{var_name} должна быть переменной, а не функцией.'
     )
 
+
+
+def patch_session_get(monkeypatch, mock_get) -> None:
+    """
+    Replaces `requests.Session.get` with a module-level style mock.
+    :param monkeypatch: pytest monkeypatch fixture
+    :param mock_get: Callable with the `requests.get` signature
+    :return: None
+    """
+    def session_get(session, *args, **kwargs):
+        return mock_get(*args, **kwargs)
+
+    monkeypatch.setattr(requests.Session, 'get', session_get)
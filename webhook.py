@@ -0,0 +1,147 @@
+import json
+import logging
+import threading
+
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+HELP = (
+    'Команды бота:\n'
+    '/subscribe <токен Практикума> — присылать статусы работ\n'
+    '/unsubscribe — отписаться от всех уведомлений\n'
+    '/status — последние статусы работ\n'
+    '/language <код> — язык уведомлений'
+)
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    """Приём обновлений Telegram и ответ методом sendMessage."""
+
+    def do_POST(self):
+        """Разбирает обновление и отвечает на команду в теле ответа."""
+        webhook = self.server.webhook
+        if self.path != webhook.path:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            update = json.loads(self.rfile.read(length))
+            reply = webhook.handle_update(update)
+        except (ValueError, AttributeError, TypeError) as error:
+            logger.warning('Некорректное обновление Telegram: %s', error)
+            reply = None
+        body = json.dumps(reply).encode() if reply else b''
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Пишет журнал запросов в logging вместо stderr."""
+        logger.debug(format, *args)
+
+
+class WebhookServer:
+    """Встроенный HTTP-сервер вебхука с командами подписки."""
+
+    def __init__(self, registry, host, port, path,
+                 subscriptions_file=None, on_change=None, languages=()):
+        """Вебхук на `host`:`port` с секретным путём `path`."""
+        self.registry = registry
+        self.languages = languages
+        self.path = path
+        self.subscriptions_file = subscriptions_file
+        self.on_change = on_change
+        self.commands = {
+            '/start': self.help,
+            '/help': self.help,
+            '/subscribe': self.subscribe,
+            '/unsubscribe': self.unsubscribe,
+            '/status': self.status,
+            '/language': self.language,
+        }
+        self.server = ThreadingHTTPServer((host, port), WebhookHandler)
+        self.server.daemon_threads = True
+        self.server.webhook = self
+        self._thread = None
+
+    @property
+    def port(self):
+        """Порт, на котором слушает сервер."""
+        return self.server.server_address[1]
+
+    def start(self):
+        """Запускает сервер в фоновом потоке."""
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, name='webhook', daemon=True
+        )
+        self._thread.start()
+        logger.info('Вебхук слушает порт %s', self.port)
+
+    def stop(self):
+        """Останавливает сервер."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def handle_update(self, update):
+        """Ответ на обновление Telegram в виде вызова sendMessage."""
+        message = update.get('message') or update.get('edited_message')
+        if not message or not message.get('text'):
+            return None
+        chat_id = message['chat']['id']
+        command, _, argument = message['text'].strip().partition(' ')
+        handler = self.commands.get(command.split('@')[0], self.help)
+        return {
+            'method': 'sendMessage',
+            'chat_id': chat_id,
+            'text': handler(chat_id, argument.strip()),
+        }
+
+    def help(self, chat_id, argument):
+        """Справка по командам."""
+        return HELP
+
+    def subscribe(self, chat_id, token):
+        """Подписывает чат на статусы работ по токену."""
+        if not token:
+            return 'Укажите токен: /subscribe <токен Практикума>'
+        self.registry.subscribe(token, chat_id)
+        self._changed()
+        return 'Подписка оформлена, статусы работ придут в этот чат.'
+
+    def unsubscribe(self, chat_id, argument):
+        """Отписывает чат от всех токенов."""
+        subscriptions = self.registry.for_chat(chat_id)
+        for subscription in subscriptions:
+            self.registry.unsubscribe(subscription.token, chat_id)
+        if not subscriptions:
+            return 'Активных подписок нет.'
+        self._changed()
+        return 'Подписка отменена.'
+
+    def status(self, chat_id, argument):
+        """Последние известные статусы работ чата."""
+        lines = [
+            f'Работа {homework}: {status}'
+            for subscription in self.registry.for_chat(chat_id)
+            for homework, status in list(subscription.statuses.items())
+        ]
+        return '\n'.join(lines) or 'Статусов пока нет.'
+
+    def language(self, chat_id, language):
+        """Меняет язык уведомлений чата."""
+        if language not in self.languages:
+            available = ', '.join(self.languages)
+            return f'Укажите язык: /language <{available}>'
+        self.registry.set_language(chat_id, language)
+        self._changed()
+        return f'Язык уведомлений: {language}'
+
+    def _changed(self):
+        if self.subscriptions_file:
+            self.registry.to_file(self.subscriptions_file)
+        if self.on_change is not None:
+            self.on_change()